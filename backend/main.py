@@ -1,24 +1,79 @@
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-import boto3
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from src.api.dependencies import (get_amazon_q_cli_status,
+                                  get_amazon_q_service, get_bedrock_service,
+                                  get_dashboard_service, get_s3_service,
+                                  refresh_aws_configuration)
 from src.api.routes import amazon_q, bedrock, dashboard
+from src.core.aws import get_boto_session
 from src.core.config import settings
+from src.core.log_context import configure_logging
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cached health verdicts so frequent probes don't hit AWS on every call
+HEALTH_CHECK_CACHE_TTL = 30  # seconds
+_health_cache = {}  # service name -> (status, expires_at)
+
+
+def _get_cached_health(service: str):
+    """Return the cached status for a service if it has not expired."""
+    entry = _health_cache.get(service)
+    if entry and time.monotonic() < entry[1]:
+        return entry[0]
+    return None
+
+
+def _set_cached_health(service: str, status: str) -> str:
+    """Store a service status with a fresh expiry and return it."""
+    _health_cache[service] = (status, time.monotonic() + HEALTH_CHECK_CACHE_TTL)
+    return status
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Amazon Q Wrapper API")
+
+    # All AWS clients share one session so service models are parsed a single time
+    app.state.boto_session = get_boto_session()
+
+    # Validate configuration once; routes reuse this verdict until the CLI probe goes stale
+    if not await refresh_aws_configuration(app):
+        logger.warning(
+            f"Missing required configuration: {', '.join(app.state.missing_configs)}"
+        )
+    logger.info(f"Amazon Q CLI status: {app.state.q_cli_status[0]}")
+
+    # Bound the default executor used by asyncio.to_thread for blocking AWS calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix="aws-io",
+        )
+    )
+
+    # Warm the cached service singletons so the first request doesn't pay for construction
+    get_amazon_q_service()
+    get_dashboard_service()
+
+    # Health checks reuse the services' clients rather than opening their own connection pools
+    app.state.bedrock_client = get_bedrock_service().client
+    app.state.s3_client = get_s3_service().s3_client if settings.s3_bucket_name else None
     yield
     # Shutdown
     logger.info("Shutting down Amazon Q Wrapper API")
@@ -29,22 +84,39 @@ app = FastAPI(
     version=settings.api_version,
     description="API for Amazon Q CLI wrapper with Bedrock integration",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+if settings.environment == "production":
+    # Explicit origins/methods/headers take Starlette's constant-time CORS checks
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=("GET", "POST"),
+        allow_headers=("authorization", "content-type"),
+    )
+else:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 # Include routers
 app.include_router(amazon_q.router, prefix="/api/v1")
 app.include_router(bedrock.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
 
+# The verbose validation logger dumps request bodies and headers, so it is debug-only too
+if settings.enable_debug_routes:
+    app.add_exception_handler(
+        RequestValidationError, bedrock.validation_exception_handler
+    )
+
 
 @app.get("/")
 async def root():
@@ -62,58 +134,77 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """Enhanced health check that verifies AWS service connectivity."""
-    try:
-        health_status = {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
-            "version": settings.api_version,
-            "services": {},
-        }
+async def _check_s3(request: Request):
+    """Check S3 bucket reachability, reusing a recent cached verdict."""
+    if not settings.s3_bucket_name:
+        return "s3", "not_configured"
 
-        # Check S3 connectivity
+    s3_status = _get_cached_health("s3")
+    if s3_status is None:
         try:
-            if settings.s3_bucket_name:
-                s3_client = boto3.client("s3", region_name=settings.s3_region)
-                s3_client.head_bucket(Bucket=settings.s3_bucket_name)
-                health_status["services"]["s3"] = "available"
-            else:
-                health_status["services"]["s3"] = "not_configured"
+            # Run the blocking head_bucket call off the event loop
+            await asyncio.to_thread(
+                request.app.state.s3_client.head_bucket,
+                Bucket=settings.s3_bucket_name,
+            )
+            s3_status = _set_cached_health("s3", "available")
         except Exception as e:
             logger.warning(f"S3 health check failed: {e}")
-            health_status["services"]["s3"] = "unavailable"
+            s3_status = _set_cached_health("s3", "unavailable")
+    return "s3", s3_status
+
 
-        # Check Bedrock connectivity
+async def _check_bedrock(request: Request):
+    """Check that the Bedrock client is available, reusing a recent cached verdict."""
+    bedrock_status = _get_cached_health("bedrock")
+    if bedrock_status is None:
         try:
-            bedrock_client = boto3.client(
-                "bedrock-agent-runtime", region_name=settings.aws_region
-            )
-            # Just check if we can create a client - actual API calls require agent setup
-            health_status["services"]["bedrock"] = "available"
+            # Client is built at startup - actual API calls require agent setup
+            if request.app.state.bedrock_client is None:
+                raise RuntimeError("Bedrock client not initialised")
+            bedrock_status = _set_cached_health("bedrock", "available")
         except Exception as e:
             logger.warning(f"Bedrock health check failed: {e}")
-            health_status["services"]["bedrock"] = "unavailable"
+            bedrock_status = _set_cached_health("bedrock", "unavailable")
+    return "bedrock", bedrock_status
 
-        # Check Amazon Q CLI connectivity
-        try:
-            import subprocess
 
-            cli_path = getattr(settings, "amazon_q_cli_path", "q")
-            result = subprocess.run(
-                [cli_path, "--help"], capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                health_status["services"]["amazon_q_cli"] = "available"
+async def _check_q_cli(request: Request):
+    """Check that the Amazon Q CLI can be executed, using the cached probe."""
+    cli_status = await get_amazon_q_cli_status(request)
+    if cli_status == "not_found":
+        logger.warning("Amazon Q CLI not found in PATH")
+        return "amazon_q_cli", "not_found"
+    if cli_status != "available":
+        logger.warning(f"Amazon Q CLI health check failed: {cli_status}")
+        return "amazon_q_cli", "unavailable"
+    return "amazon_q_cli", "available"
+
+
+@app.get("/health")
+async def health_check(request: Request):
+    """Enhanced health check that verifies AWS service connectivity."""
+    try:
+        health_status = {
+            "status": "healthy",
+            "timestamp": datetime.utcnow(),  # ORJSONResponse serializes datetimes natively
+            "version": settings.api_version,
+            "services": {},
+        }
+
+        # Run all service checks concurrently
+        results = await asyncio.gather(
+            _check_s3(request),
+            _check_bedrock(request),
+            _check_q_cli(request),
+            return_exceptions=True,
+        )
+        for service, result in zip(("s3", "bedrock", "amazon_q_cli"), results):
+            if isinstance(result, Exception):
+                logger.warning(f"{service} health check failed: {result}")
+                health_status["services"][service] = "unavailable"
             else:
-                health_status["services"]["amazon_q_cli"] = "unavailable"
-        except FileNotFoundError:
-            logger.warning("Amazon Q CLI not found in PATH")
-            health_status["services"]["amazon_q_cli"] = "not_found"
-        except Exception as e:
-            logger.warning(f"Amazon Q CLI health check failed: {e}")
-            health_status["services"]["amazon_q_cli"] = "unavailable"
+                health_status["services"][result[0]] = result[1]
 
         # Determine overall status
         service_statuses = list(health_status["services"].values())
@@ -1,33 +1,52 @@
+import asyncio
+import shutil
+import time
 from functools import lru_cache
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, List
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from src.core.config import settings
-from src.services.amazon_q_service import AmazonQService
-from src.services.bedrock_service import BedrockService
-from src.services.dashboard_service import DashboardService
-from src.services.s3_service import S3Service
+
+# Services are imported lazily in their factories so boot only pays for what is used
+if TYPE_CHECKING:
+    from src.services.amazon_q_service import AmazonQService
+    from src.services.bedrock_service import BedrockService
+    from src.services.dashboard_service import DashboardService
+    from src.services.s3_service import S3Service
 
 # Security
 security = HTTPBearer(auto_error=False)
 
+# How long a cached Amazon Q CLI probe result stays valid
+AMAZON_Q_CLI_PROBE_TTL = 60  # seconds
+
+# How often a CLI already known to work is exec'd again, so a broken install is still caught
+AMAZON_Q_CLI_SMOKE_TEST_TTL = 15 * 60  # seconds
+
+# Serializes re-probes so concurrent requests share a single CLI fork
+_cli_probe_lock = asyncio.Lock()
+
 
 # Service dependencies
 @lru_cache()
-def get_amazon_q_service() -> AmazonQService:
+def get_amazon_q_service() -> "AmazonQService":
     """Get Amazon Q service instance."""
+    from src.services.amazon_q_service import AmazonQService
+
     return AmazonQService(
-        cli_path=getattr(settings, "amazon_q_cli_path", None),
-        aws_profile=getattr(settings, "aws_profile", None),
+        cli_path=settings.amazon_q_cli_path,
+        aws_profile=settings.aws_profile,
         region=settings.aws_region,
     )
 
 
 @lru_cache()
-def get_bedrock_service() -> BedrockService:
+def get_bedrock_service() -> "BedrockService":
     """Get Bedrock service instance."""
+    from src.services.bedrock_service import BedrockService
+
     return BedrockService(
         region=settings.bedrock_region,
         timeout=settings.bedrock_timeout,
@@ -37,8 +56,10 @@ def get_bedrock_service() -> BedrockService:
 
 
 @lru_cache()
-def get_s3_service() -> S3Service:
+def get_s3_service() -> "S3Service":
     """Get S3 service instance."""
+    from src.services.s3_service import S3Service
+
     if not settings.s3_bucket_name:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,8 +74,10 @@ def get_s3_service() -> S3Service:
 
 
 @lru_cache()
-def get_dashboard_service() -> DashboardService:
+def get_dashboard_service() -> "DashboardService":
     """Get dashboard service instance."""
+    from src.services.dashboard_service import DashboardService
+
     return DashboardService()
 
 
@@ -75,34 +98,80 @@ async def get_current_user(
     return {"user_id": "anonymous", "permissions": ["read", "write"]}
 
 
-# Validation dependencies
-def validate_aws_configuration():
-    """Validate that AWS services are properly configured."""
-    missing_configs = []
+# Amazon Q CLI probe
+async def probe_amazon_q_cli(run_smoke_test: bool = True) -> str:
+    """
+    Check the Amazon Q CLI without blocking the event loop.
+    The executable is located on PATH first; `q --help` only runs when
+    run_smoke_test is set, so most re-probes never fork.
+    Returns one of: available, unavailable, not_found, invalid, error.
+    """
+    cli_path = settings.amazon_q_cli_path
+    # Validate CLI path to prevent injection attacks
+    if not cli_path or not isinstance(cli_path, str) or len(cli_path) > 255:
+        return "invalid"
 
-    # Check for Amazon Q CLI availability
-    import shlex
-    import subprocess
+    if shutil.which(cli_path) is None:
+        return "not_found"
+    if not run_smoke_test:
+        return "available"
 
     try:
-        cli_path = getattr(settings, "amazon_q_cli_path", "q")
-        # Validate CLI path to prevent injection attacks
-        if not cli_path or not isinstance(cli_path, str) or len(cli_path) > 255:
-            missing_configs.append("AMAZON_Q_CLI (invalid path configuration)")
-        else:
-            # Use shell=False and properly escaped arguments for security
-            result = subprocess.run(
-                [cli_path, "--help"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                shell=False,
-            )  # Explicitly disable shell for security
-            if result.returncode != 0:
-                missing_configs.append("AMAZON_Q_CLI (command 'q' not working)")
+        # Exec directly (no shell) with properly separated arguments for security
+        process = await asyncio.create_subprocess_exec(
+            cli_path,
+            "--help",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
     except FileNotFoundError:
-        missing_configs.append("AMAZON_Q_CLI (command 'q' not found)")
+        return "not_found"
     except Exception:
+        return "error"
+
+    try:
+        returncode = await asyncio.wait_for(
+            process.wait(), timeout=settings.health_check_timeout
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return "unavailable"
+
+    return "available" if returncode == 0 else "unavailable"
+
+
+def _cli_status_is_stale(app) -> bool:
+    cached = getattr(app.state, "q_cli_status", None)
+    return cached is None or time.monotonic() - cached[1] > AMAZON_Q_CLI_PROBE_TTL
+
+
+async def get_amazon_q_cli_status(request: Request) -> str:
+    """Return the cached Amazon Q CLI status, re-probing only when it is stale."""
+    if _cli_status_is_stale(request.app):
+        async with _cli_probe_lock:
+            # Another request may have refreshed the status while we waited
+            if _cli_status_is_stale(request.app):
+                await refresh_aws_configuration(request.app)
+    return request.app.state.q_cli_status[0]
+
+
+def _missing_configuration(cli_status: str) -> List[str]:
+    """List required configuration that is missing or not working."""
+    missing_configs = []
+
+    # Check for Amazon Q CLI availability
+    if cli_status == "invalid":
+        missing_configs.append("AMAZON_Q_CLI (invalid path configuration)")
+    elif cli_status == "unavailable":
+        missing_configs.append(
+            f"AMAZON_Q_CLI (command '{settings.amazon_q_cli_path}' not working)"
+        )
+    elif cli_status == "not_found":
+        missing_configs.append(
+            f"AMAZON_Q_CLI (command '{settings.amazon_q_cli_path}' not found)"
+        )
+    elif cli_status == "error":
         missing_configs.append("AMAZON_Q_CLI (unable to verify)")
 
     # Check other required configurations
@@ -111,19 +180,52 @@ def validate_aws_configuration():
     if not settings.s3_bucket_name:
         missing_configs.append("S3_BUCKET_NAME")
 
-    if missing_configs:
+    return missing_configs
+
+
+async def refresh_aws_configuration(app) -> bool:
+    """
+    Probe the Amazon Q CLI and validate settings, caching the verdict on app.state.
+    Called once at startup and again only when the cached CLI probe goes stale.
+    """
+    now = time.monotonic()
+    previous = getattr(app.state, "q_cli_status", None)
+    last_smoke_test = getattr(app.state, "q_cli_smoke_tested_at", None)
+    # Exec the CLI until it is known to work, then again only every smoke-test interval
+    run_smoke_test = (
+        previous is None
+        or previous[0] != "available"
+        or last_smoke_test is None
+        or now - last_smoke_test > AMAZON_Q_CLI_SMOKE_TEST_TTL
+    )
+    cli_status = await probe_amazon_q_cli(run_smoke_test)
+    if run_smoke_test:
+        app.state.q_cli_smoke_tested_at = now
+    app.state.q_cli_status = (cli_status, time.monotonic())
+    app.state.missing_configs = _missing_configuration(cli_status)
+    app.state.config_valid = not app.state.missing_configs
+    return app.state.config_valid
+
+
+# Validation dependencies
+async def validate_aws_configuration(request: Request):
+    """Validate that AWS services are properly configured (cached at startup)."""
+    state = request.app.state
+    await get_amazon_q_cli_status(request)
+
+    if not state.config_valid:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Missing required configuration: {', '.join(missing_configs)}",
+            detail=f"Missing required configuration: {', '.join(state.missing_configs)}",
         )
 
     return True
 
 
 # Type aliases for dependencies
-AmazonQServiceDep = Annotated[AmazonQService, Depends(get_amazon_q_service)]
-BedrockServiceDep = Annotated[BedrockService, Depends(get_bedrock_service)]
-S3ServiceDep = Annotated[S3Service, Depends(get_s3_service)]
-DashboardServiceDep = Annotated[DashboardService, Depends(get_dashboard_service)]
+AmazonQServiceDep = Annotated["AmazonQService", Depends(get_amazon_q_service)]
+BedrockServiceDep = Annotated["BedrockService", Depends(get_bedrock_service)]
+S3ServiceDep = Annotated["S3Service", Depends(get_s3_service)]
+DashboardServiceDep = Annotated["DashboardService", Depends(get_dashboard_service)]
 CurrentUserDep = Annotated[dict, Depends(get_current_user)]
 ConfigValidationDep = Annotated[bool, Depends(validate_aws_configuration)]
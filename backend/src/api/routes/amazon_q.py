@@ -1,19 +1,42 @@
 import logging
-import uuid
-from datetime import datetime
-from typing import List
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 
 from src.api.dependencies import AmazonQServiceDep, ConfigValidationDep
-from src.models.requests import CostOptimizationQuery, UnderutilizationQuery
-from src.models.responses import AmazonQResponse, create_response
+from src.models.requests import (ChatRequest, CostOptimizationQuery,
+                                 UnderutilizationQuery)
+from src.models.responses import (AmazonQResponse, QueryType, build_response,
+                                  create_model_response, create_response)
+from src.utils.helpers import utc_now_iso
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/amazon-q", tags=["Amazon Q"])
 
-
-@router.post("/cost-optimization", response_model=dict)
+# Response metadata shared across requests
+DEFAULT_ANALYSIS_SERVICES = ("EC2", "EBS", "S3", "Lambda", "RDS")
+
+COST_OPTIMIZATION_MSG = "Cost optimization analysis completed successfully"
+UNDERUTILIZATION_QUERY_TMPL = "Underutilization analysis for {resource_type} over {time_range}"
+UNDERUTILIZATION_MSG_TMPL = "Underutilization analysis for {resource_type} completed successfully"
+CHAT_MSG = "Chat completed successfully"
+EC2_QUERY_TMPL = "EC2 underutilization analysis for {time_range}"
+EC2_MSG = "EC2 underutilization analysis completed successfully"
+EBS_QUERY = "EBS volumes underutilization analysis"
+EBS_MSG = "EBS underutilization analysis completed successfully"
+S3_QUERY = "S3 buckets underutilization analysis"
+S3_MSG = "S3 underutilization analysis completed successfully"
+LAMBDA_QUERY = "Lambda functions underutilization analysis"
+LAMBDA_MSG = "Lambda underutilization analysis completed successfully"
+RDS_QUERY = "RDS instances underutilization analysis"
+RDS_MSG = "RDS underutilization analysis completed successfully"
+COMPREHENSIVE_QUERY_TMPL = "Comprehensive cost analysis for services: {services}"
+COMPREHENSIVE_MSG_TMPL = "Comprehensive cost analysis completed for {count} services"
+DASHBOARD_QUERY_TMPL = "Dashboard creation query for {services}: {query}"
+DASHBOARD_MSG_TMPL = "Dashboard-specific analysis completed for {count} services with enhanced detail"
+
+
+@router.post("/cost-optimization")
 async def query_cost_optimization(
     request: CostOptimizationQuery,
     amazon_q: AmazonQServiceDep,
@@ -35,18 +58,23 @@ async def query_cost_optimization(
         result = await amazon_q.query_cost_optimization(request.query)
 
         # Create response
-        response_data = AmazonQResponse(
+        response_data = build_response(
+            AmazonQResponse,
             query=request.query,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="cost_optimization",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.COST_OPTIMIZATION,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="Cost optimization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=COST_OPTIMIZATION_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -54,7 +82,7 @@ async def query_cost_optimization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/underutilization", response_model=dict)
+@router.post("/underutilization")
 async def query_underutilization(
     request: UnderutilizationQuery,
     amazon_q: AmazonQServiceDep,
@@ -78,18 +106,27 @@ async def query_underutilization(
         )
 
         # Create response
-        response_data = AmazonQResponse(
-            query=f"Underutilization analysis for {request.resource_type} over {request.time_range}",
+        response_data = build_response(
+            AmazonQResponse,
+            query=UNDERUTILIZATION_QUERY_TMPL.format(
+                resource_type=request.resource_type, time_range=request.time_range
+            ),
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="underutilization",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.UNDERUTILIZATION,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message=f"Underutilization analysis for {request.resource_type} completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=UNDERUTILIZATION_MSG_TMPL.format(
+                    resource_type=request.resource_type
+                ),
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -97,12 +134,11 @@ async def query_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/chat", response_model=dict)
+@router.post("/chat")
 async def chat_with_amazon_q(
-    message: str,
+    request: ChatRequest,
     amazon_q: AmazonQServiceDep,
     config_valid: ConfigValidationDep,
-    conversation_id: str = None,
 ):
     """
     Direct chat interface with Amazon Q.
@@ -110,23 +146,29 @@ async def chat_with_amazon_q(
     This endpoint provides a direct chat interface for custom queries.
     """
     try:
-        logger.info(f"Processing chat message: {message[:100]}...")
+        logger.info(f"Processing chat message: {request.message[:100]}...")
 
         # Chat with Amazon Q
-        result = await amazon_q.chat(message, conversation_id)
+        result = await amazon_q.chat(request.message, request.conversation_id)
 
         # Create response
-        response_data = AmazonQResponse(
-            query=message,
+        response_data = build_response(
+            AmazonQResponse,
+            query=request.message,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="chat",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.CHAT,
         )
 
-        return create_response(
-            data=response_data.dict(), message="Chat completed successfully"
+        return Response(
+            create_model_response(
+                response_data,
+                message=CHAT_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -134,7 +176,7 @@ async def chat_with_amazon_q(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/conversations/{conversation_id}", response_model=dict)
+@router.get("/conversations/{conversation_id}")
 async def get_conversation_history(
     conversation_id: str, amazon_q: AmazonQServiceDep, config_valid: ConfigValidationDep
 ):
@@ -164,7 +206,7 @@ async def get_conversation_history(
 # New specific service analysis endpoints
 
 
-@router.post("/analyze/ec2", response_model=dict)
+@router.post("/analyze/ec2")
 async def analyze_ec2_underutilization(
     amazon_q: AmazonQServiceDep,
     config_valid: ConfigValidationDep,
@@ -183,18 +225,23 @@ async def analyze_ec2_underutilization(
 
         result = await amazon_q.analyze_ec2_underutilization(time_range)
 
-        response_data = AmazonQResponse(
-            query=f"EC2 underutilization analysis for {time_range}",
+        response_data = build_response(
+            AmazonQResponse,
+            query=EC2_QUERY_TMPL.format(time_range=time_range),
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="ec2_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.EC2,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="EC2 underutilization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=EC2_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -202,7 +249,7 @@ async def analyze_ec2_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/ebs", response_model=dict)
+@router.post("/analyze/ebs")
 async def analyze_ebs_underutilization(
     amazon_q: AmazonQServiceDep, config_valid: ConfigValidationDep
 ):
@@ -219,18 +266,23 @@ async def analyze_ebs_underutilization(
 
         result = await amazon_q.analyze_ebs_underutilization()
 
-        response_data = AmazonQResponse(
-            query="EBS volumes underutilization analysis",
+        response_data = build_response(
+            AmazonQResponse,
+            query=EBS_QUERY,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="ebs_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.EBS,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="EBS underutilization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=EBS_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -238,7 +290,7 @@ async def analyze_ebs_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/s3", response_model=dict)
+@router.post("/analyze/s3")
 async def analyze_s3_underutilization(
     amazon_q: AmazonQServiceDep, config_valid: ConfigValidationDep
 ):
@@ -255,18 +307,23 @@ async def analyze_s3_underutilization(
 
         result = await amazon_q.analyze_s3_underutilization()
 
-        response_data = AmazonQResponse(
-            query="S3 buckets underutilization analysis",
+        response_data = build_response(
+            AmazonQResponse,
+            query=S3_QUERY,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="s3_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.S3,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="S3 underutilization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=S3_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -274,7 +331,7 @@ async def analyze_s3_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/lambda", response_model=dict)
+@router.post("/analyze/lambda")
 async def analyze_lambda_underutilization(
     amazon_q: AmazonQServiceDep, config_valid: ConfigValidationDep
 ):
@@ -291,18 +348,23 @@ async def analyze_lambda_underutilization(
 
         result = await amazon_q.analyze_lambda_underutilization()
 
-        response_data = AmazonQResponse(
-            query="Lambda functions underutilization analysis",
+        response_data = build_response(
+            AmazonQResponse,
+            query=LAMBDA_QUERY,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="lambda_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.LAMBDA,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="Lambda underutilization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=LAMBDA_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -310,7 +372,7 @@ async def analyze_lambda_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/rds", response_model=dict)
+@router.post("/analyze/rds")
 async def analyze_rds_underutilization(
     amazon_q: AmazonQServiceDep, config_valid: ConfigValidationDep
 ):
@@ -327,18 +389,23 @@ async def analyze_rds_underutilization(
 
         result = await amazon_q.analyze_rds_underutilization()
 
-        response_data = AmazonQResponse(
-            query="RDS instances underutilization analysis",
+        response_data = build_response(
+            AmazonQResponse,
+            query=RDS_QUERY,
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="rds_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.RDS,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message="RDS underutilization analysis completed successfully",
+        return Response(
+            create_model_response(
+                response_data,
+                message=RDS_MSG,
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -346,11 +413,11 @@ async def analyze_rds_underutilization(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/comprehensive", response_model=dict)
+@router.post("/analyze/comprehensive")
 async def comprehensive_cost_analysis(
     amazon_q: AmazonQServiceDep,
     config_valid: ConfigValidationDep,
-    services: List[str] = None,
+    services: list[str] = None,
 ):
     """
     Perform comprehensive cost optimization analysis across multiple AWS services.
@@ -359,23 +426,28 @@ async def comprehensive_cost_analysis(
     including EC2, EBS, S3, Lambda, RDS and provides prioritized recommendations.
     """
     try:
-        services_list = services or ["EC2", "EBS", "S3", "Lambda", "RDS"]
+        services_list = services or list(DEFAULT_ANALYSIS_SERVICES)
         logger.info(f"Performing comprehensive analysis for services: {services_list}")
 
         result = await amazon_q.comprehensive_cost_analysis(services_list)
 
-        response_data = AmazonQResponse(
-            query=f"Comprehensive cost analysis for services: {', '.join(services_list)}",
+        response_data = build_response(
+            AmazonQResponse,
+            query=COMPREHENSIVE_QUERY_TMPL.format(services=", ".join(services_list)),
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="comprehensive_analysis",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.COMPREHENSIVE,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message=f"Comprehensive cost analysis completed for {len(services_list)} services",
+        return Response(
+            create_model_response(
+                response_data,
+                message=COMPREHENSIVE_MSG_TMPL.format(count=len(services_list)),
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -383,12 +455,12 @@ async def comprehensive_cost_analysis(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze/for-dashboard", response_model=dict)
+@router.post("/analyze/for-dashboard")
 async def query_for_dashboard_creation(
     request: CostOptimizationQuery,
     amazon_q: AmazonQServiceDep,
     config_valid: ConfigValidationDep,
-    services: List[str] = None,
+    services: list[str] = None,
 ):
     """
     Query Amazon Q specifically for dashboard creation with enhanced prompting.
@@ -398,7 +470,7 @@ async def query_for_dashboard_creation(
     detailed, specific, and actionable data with exact resource identifiers and cost calculations.
     """
     try:
-        services_list = services or ["EC2", "EBS", "S3", "Lambda", "RDS"]
+        services_list = services or list(DEFAULT_ANALYSIS_SERVICES)
         logger.info(f"Querying Amazon Q for dashboard creation: {request.query[:100]}...")
         logger.info(f"Services to analyze: {services_list}")
 
@@ -408,18 +480,25 @@ async def query_for_dashboard_creation(
             services=services_list
         )
 
-        response_data = AmazonQResponse(
-            query=f"Dashboard creation query for {', '.join(services_list)}: {request.query}",
+        response_data = build_response(
+            AmazonQResponse,
+            query=DASHBOARD_QUERY_TMPL.format(
+                services=", ".join(services_list), query=request.query
+            ),
             response=result["response"],
             conversation_id=result.get("conversation_id"),
             source_attributions=result.get("source_attributions", []),
-            timestamp=datetime.utcnow().isoformat(),
-            query_type="dashboard_creation",
+            timestamp=utc_now_iso(),
+            query_type=QueryType.DASHBOARD,
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message=f"Dashboard-specific analysis completed for {len(services_list)} services with enhanced detail",
+        return Response(
+            create_model_response(
+                response_data,
+                message=DASHBOARD_MSG_TMPL.format(count=len(services_list)),
+                timestamp=response_data.timestamp,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -1,26 +1,73 @@
-import json
+"""
+Bedrock processing routes.
+
+The /debug-dashboard-summary and /raw-dashboard-summary introspection endpoints
+and validation_exception_handler log full request bodies, so they are only
+registered when ENABLE_DEBUG_ROUTES=true (the handler is registered by main.py).
+"""
+
+import asyncio
 import logging
-import uuid
-from datetime import datetime
+from itertools import islice
+from secrets import token_hex
 
+import orjson
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from pydantic import ValidationError
 from fastapi.exception_handlers import request_validation_exception_handler
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from src.api.dependencies import BedrockServiceDep, ConfigValidationDep
 from src.core.config import settings
 from src.models.requests import (BedrockProcessingRequest,
                                  BulkDataProcessingRequest,
                                  DashboardSummaryRequest)
-from src.models.responses import BedrockProcessingResponse, create_response
+from src.models.responses import create_response
+from src.utils.helpers import utc_now_iso
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/bedrock", tags=["Bedrock Processing"])
+router = APIRouter(
+    prefix="/bedrock",
+    tags=["Bedrock Processing"],
+    default_response_class=ORJSONResponse,
+)
+
+# Maximum number of request body bytes written to validation error logs
+VALIDATION_LOG_BODY_LIMIT = 2048
+
+# Maximum number of bytes of parsed JSON dumped by the raw debug endpoint
+RAW_LOG_DUMP_LIMIT = 4096
+
+
+def _processing_response(
+    message: str,
+    processed_data,
+    processing_type: str,
+    session_id: str,
+    metadata: dict,
+) -> ORJSONResponse:
+    """
+    Build the create_response envelope around a BedrockProcessingResponse payload
+    as one plain dict, skipping model construction and re-serialization.
+    """
+    timestamp = utc_now_iso()
+    return ORJSONResponse(
+        {
+            "success": True,
+            "message": message,
+            "data": {
+                "processed_data": processed_data,
+                "processing_type": processing_type,
+                "session_id": session_id,
+                "timestamp": timestamp,
+                "metadata": metadata,
+            },
+            "timestamp": timestamp,
+        }
+    )
 
 
-@router.post("/process", response_model=dict)
+@router.post("/process")
 async def process_data_objects(
     request: BedrockProcessingRequest,
     bedrock: BedrockServiceDep,
@@ -33,8 +80,11 @@ async def process_data_objects(
     a Bedrock agent to create a comprehensive analysis and summary.
     """
     try:
+        object_count = len(request.data_objects)
         logger.info(
-            f"Processing {len(request.data_objects)} data objects with type: {request.processing_type}"
+            "Processing %d data objects with type: %s",
+            object_count,
+            request.processing_type,
         )
 
         # Use provided agent IDs or fall back to settings
@@ -53,95 +103,99 @@ async def process_data_objects(
             agent_alias_id=agent_alias_id,
         )
 
-        # Create response
-        response_data = BedrockProcessingResponse(
+        return _processing_response(
+            message=f"Successfully processed {object_count} data objects",
             processed_data=result["response"],
             processing_type=request.processing_type,
-            session_id=f"session-{uuid.uuid4().hex[:8]}",
-            timestamp=datetime.utcnow().isoformat(),
+            session_id=f"session-{token_hex(4)}",
             metadata={
-                "input_objects_count": len(request.data_objects),
+                "input_objects_count": object_count,
                 "agent_id": agent_id,
                 "agent_alias_id": agent_alias_id,
             },
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message=f"Successfully processed {len(request.data_objects)} data objects",
-        )
-
+    except HTTPException:
+        # Keep the status code chosen by the handler or the service layer
+        raise
     except Exception as e:
-        logger.error(f"Error in Bedrock processing: {e}")
+        logger.exception("Error in Bedrock processing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/debug-dashboard-summary", response_model=dict)
 async def debug_dashboard_summary(request: Request):
     """Debug endpoint to see raw request body"""
     try:
         body = await request.body()
         content_type = request.headers.get("content-type", "")
-        logger.info(f"DEBUG - Raw request body: {body}")
-        logger.info(f"DEBUG - Content-Type: {content_type}")
+        logger.info("DEBUG - Raw request body: %s", body)
+        logger.info("DEBUG - Content-Type: %s", content_type)
 
         if content_type.startswith("application/json"):
             try:
-                import json
-                parsed = json.loads(body)
-                logger.info(f"DEBUG - Parsed JSON: {parsed}")
-            except Exception as e:
-                logger.error(f"DEBUG - JSON parse error: {e}")
+                parsed = orjson.loads(body)
+                logger.info("DEBUG - Parsed JSON: %s", parsed)
+            except orjson.JSONDecodeError as e:
+                logger.error("DEBUG - JSON parse error: %s", e)
 
         return {"status": "debug", "body_length": len(body), "content_type": content_type}
     except Exception as e:
-        logger.error(f"DEBUG - Error: {e}")
+        logger.error("DEBUG - Error: %s", e)
         return {"status": "error", "error": str(e)}
 
-# Add exception handler for validation errors
+# Exception handler for validation errors (registered on the app in main.py)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Validation error for {request.url}: {exc}")
-    logger.error(f"Request body: {await request.body()}")
-    logger.error(f"Request headers: {dict(request.headers)}")
-    logger.error(f"Validation details: {exc.errors()}")
+    logger.error("Validation error for %s: %s", request.url, exc)
+
+    # FastAPI already attached the parsed body to the exception - don't re-read the stream
+    body = exc.body if isinstance(exc.body, (bytes, str)) else repr(exc.body)
+    if len(body) > VALIDATION_LOG_BODY_LIMIT:
+        logger.error("Request body: %s…(truncated)", body[:VALIDATION_LOG_BODY_LIMIT])
+    else:
+        logger.error("Request body: %s", body)
+    logger.error("Request headers: %s", request.headers)
+    logger.error("Validation details: %s", exc.errors())
 
     # Return the default error response
     return await request_validation_exception_handler(request, exc)
 
-@router.post("/raw-dashboard-summary")
 async def raw_dashboard_summary(request: Request):
     """Raw endpoint to see exactly what's being sent"""
     try:
         body = await request.body()
         content_type = request.headers.get("content-type", "")
         
-        logger.info(f"RAW REQUEST - URL: {request.url}")
-        logger.info(f"RAW REQUEST - Method: {request.method}")
-        logger.info(f"RAW REQUEST - Headers: {dict(request.headers)}")
-        logger.info(f"RAW REQUEST - Body: {body}")
-        logger.info(f"RAW REQUEST - Content-Type: {content_type}")
+        logger.info("RAW REQUEST - URL: %s", request.url)
+        logger.info("RAW REQUEST - Method: %s", request.method)
+        logger.info("RAW REQUEST - Headers: %s", request.headers)
+        logger.info("RAW REQUEST - Body: %s", body)
+        logger.info("RAW REQUEST - Content-Type: %s", content_type)
         
         if content_type.startswith("application/json"):
             try:
-                import json
-                parsed = json.loads(body)
-                logger.info(f"RAW REQUEST - Parsed JSON: {parsed}")
-                logger.info(f"RAW REQUEST - Keys: {list(parsed.keys()) if isinstance(parsed, dict) else 'Not a dict'}")
-                
-                # Check each field
-                if isinstance(parsed, dict):
-                    for key, value in parsed.items():
-                        logger.info(f"RAW REQUEST - Field '{key}': type={type(value).__name__}, value={repr(value)}")
-                        
-            except Exception as e:
-                logger.error(f"RAW REQUEST - JSON parse error: {e}")
+                parsed = orjson.loads(body)
+
+                # One truncated C-level dump instead of repr() on every field
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "RAW REQUEST - Parsed JSON (truncated): %s",
+                        orjson.dumps(parsed, option=orjson.OPT_INDENT_2)[
+                            :RAW_LOG_DUMP_LIMIT
+                        ].decode(errors="replace"),
+                    )
+                    logger.debug(
+                        "RAW REQUEST - Top-level keys: %s",
+                        list(parsed.keys()) if isinstance(parsed, dict) else None,
+                    )
+            except orjson.JSONDecodeError as e:
+                logger.error("RAW REQUEST - JSON parse error: %s", e)
         
         return {"status": "raw_intercepted", "body_length": len(body)}
     except Exception as e:
-        logger.error(f"RAW REQUEST - Error: {e}")
+        logger.error("RAW REQUEST - Error: %s", e)
         return {"status": "error", "error": str(e)}
 
-@router.post("/create-dashboard-summary", response_model=dict)
+@router.post("/create-dashboard-summary")
 async def create_dashboard_summary(
     request: DashboardSummaryRequest,
     bedrock: BedrockServiceDep,
@@ -154,7 +208,12 @@ async def create_dashboard_summary(
     optimized for dashboard visualization.
     """
     try:
-        logger.info(f"Creating dashboard summary - processed_data length: {len(request.processed_data)}, agent_id: {request.agent_id}, agent_alias_id: {request.agent_alias_id}")
+        logger.info(
+            "Creating dashboard summary - processed_data length: %d, agent_id: %s, agent_alias_id: %s",
+            len(request.processed_data),
+            request.agent_id,
+            request.agent_alias_id,
+        )
 
         # Use provided agent IDs or fall back to settings
         agent_id = request.agent_id or settings.bedrock_agent_id
@@ -174,16 +233,15 @@ async def create_dashboard_summary(
 
         # Try to parse the response as JSON for structured data
         try:
-            parsed_response = json.loads(result["response"])
-        except (json.JSONDecodeError, KeyError):
+            parsed_response = orjson.loads(result["response"])
+        except (orjson.JSONDecodeError, KeyError, TypeError):
             parsed_response = result["response"]
 
-        # Create response
-        response_data = BedrockProcessingResponse(
+        return _processing_response(
+            message="Dashboard summary created successfully",
             processed_data=parsed_response,
             processing_type="dashboard_summary",
-            session_id=f"dashboard-session-{uuid.uuid4().hex[:8]}",
-            timestamp=datetime.utcnow().isoformat(),
+            session_id=f"dashboard-session-{token_hex(4)}",
             metadata={
                 "agent_id": agent_id,
                 "agent_alias_id": agent_alias_id,
@@ -191,19 +249,15 @@ async def create_dashboard_summary(
             },
         )
 
-        return create_response(
-            data=response_data.dict(), message="Dashboard summary created successfully"
-        )
-
-    except ValidationError as ve:
-        logger.error(f"Validation error in dashboard summary: {ve}")
-        raise HTTPException(status_code=422, detail=f"Validation error: {ve}")
+    except HTTPException:
+        # Keep the status code chosen by the handler or the service layer
+        raise
     except Exception as e:
-        logger.error(f"Error creating dashboard summary: {e}")
+        logger.exception("Error creating dashboard summary: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/bulk-process", response_model=dict)
+@router.post("/bulk-process")
 async def bulk_process_data(
     request: BulkDataProcessingRequest,
     background_tasks: BackgroundTasks,
@@ -217,63 +271,84 @@ async def bulk_process_data(
     and can be run asynchronously for better performance.
     """
     try:
-        logger.info(f"Starting bulk processing of {len(request.data_objects)} objects")
+        data_objects = request.data_objects
+        object_count = len(data_objects)
+        logger.info("Starting bulk processing of %d objects", object_count)
 
         # For now, process synchronously in batches
         # In production, you might want to use Celery or similar for async processing
 
         batch_size = request.batch_size
-        data_objects = request.data_objects
-        results = []
-
-        # Process in batches
-        for i in range(0, len(data_objects), batch_size):
-            batch = data_objects[i : i + batch_size]
-            logger.info(
-                f"Processing batch {i // batch_size + 1} with {len(batch)} objects"
-            )
-
-            # Create processing request for this batch
-            batch_request = BedrockProcessingRequest(
-                data_objects=batch, processing_type="analysis"
-            )
-
-            # Process batch
-            result = await bedrock.process_data_objects(
-                data_objects=batch,
-                agent_id=settings.bedrock_agent_id,
-                agent_alias_id=settings.bedrock_agent_alias_id,
-            )
-
-            results.append(
-                {
-                    "batch_number": i // batch_size + 1,
-                    "objects_processed": len(batch),
-                    "result": result["response"],
-                }
-            )
+        num_batches = (object_count + batch_size - 1) // batch_size
+        results = [None] * num_batches
+        agent_id = settings.bedrock_agent_id
+        agent_alias_id = settings.bedrock_agent_alias_id
+
+        # Bound how many batches are in flight against Bedrock at once
+        semaphore = asyncio.Semaphore(request.max_concurrency)
+
+        async def run_batch(batch_index: int, batch: list):
+            batch_len = len(batch)
+            async with semaphore:
+                logger.info(
+                    "Processing batch %d with %d objects", batch_index + 1, batch_len
+                )
+                result = await bedrock.process_data_objects(
+                    data_objects=batch,
+                    agent_id=agent_id,
+                    agent_alias_id=agent_alias_id,
+                )
+                return batch_index, batch_len, result
+
+        # Pull batches off a single iterator instead of re-slicing the input list
+        objects_iter = iter(data_objects)
+        batches = iter(lambda: list(islice(objects_iter, batch_size)), [])
+
+        # Process batches concurrently; the returned index preserves ordering
+        tasks = [
+            asyncio.create_task(run_batch(i, batch)) for i, batch in enumerate(batches)
+        ]
+        try:
+            batch_outputs = await asyncio.gather(*tasks)
+        except BaseException:
+            # The request fails as a whole, so stop the sibling Bedrock calls too
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        for batch_index, objects_processed, result in batch_outputs:
+            results[batch_index] = {
+                "batch_number": batch_index + 1,
+                "objects_processed": objects_processed,
+                "result": result["response"],
+            }
 
         # Create consolidated response
         response_data = {
-            "total_objects": len(data_objects),
-            "total_batches": len(results),
+            "total_objects": object_count,
+            "total_batches": num_batches,
             "batch_size": batch_size,
             "batch_results": results,
             "processing_options": request.processing_options,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
         }
 
-        return create_response(
-            data=response_data,
-            message=f"Bulk processing completed: {len(data_objects)} objects in {len(results)} batches",
+        return ORJSONResponse(
+            create_response(
+                data=response_data,
+                message=f"Bulk processing completed: {object_count} objects in {num_batches} batches",
+            )
         )
 
+    except HTTPException:
+        # Keep the status code chosen by the handler or the service layer
+        raise
     except Exception as e:
-        logger.error(f"Error in bulk processing: {e}")
+        logger.exception("Error in bulk processing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/session/{session_id}/status", response_model=dict)
+@router.get("/session/{session_id}/status")
 async def get_session_status(
     session_id: str, bedrock: BedrockServiceDep, config_valid: ConfigValidationDep
 ):
@@ -286,15 +361,30 @@ async def get_session_status(
     try:
         # This would require session state management
         # For now, return a placeholder response
-        return create_response(
-            data={
-                "session_id": session_id,
-                "status": "placeholder",
-                "message": "Session status tracking not yet implemented",
-            },
-            message="Session status placeholder",
+        return ORJSONResponse(
+            create_response(
+                data={
+                    "session_id": session_id,
+                    "status": "placeholder",
+                    "message": "Session status tracking not yet implemented",
+                },
+                message="Session status placeholder",
+            )
         )
 
+    except HTTPException:
+        # Keep the status code chosen by the handler or the service layer
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving session status: {e}")
+        logger.exception("Error retrieving session status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# Request introspection endpoints stay off the production router
+if settings.enable_debug_routes:
+    router.add_api_route(
+        "/debug-dashboard-summary", debug_dashboard_summary, methods=["POST"]
+    )
+    router.add_api_route(
+        "/raw-dashboard-summary", raw_dashboard_summary, methods=["POST"]
+    )
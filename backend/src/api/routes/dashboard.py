@@ -1,25 +1,299 @@
-import json
+import asyncio
 import logging
 import uuid
 from datetime import datetime
+from functools import partial
+from typing import (Awaitable, Callable, Dict, List, Mapping, Optional, Tuple,
+                    Union)
 
+import orjson
 from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 
 from src.api.dependencies import (AmazonQServiceDep, BedrockServiceDep,
                                   ConfigValidationDep, DashboardServiceDep,
                                   S3ServiceDep)
-from src.models.requests import (DashboardGenerationRequest,
-                                 MultiStepWorkflowRequest)
-from src.models.responses import (DashboardResponse, WorkflowResponse,
-                                  create_response)
+from src.core.config import settings
+from src.core.log_context import workflow_id_var
+from src.models.requests import (CostOptimizationQuery,
+                                 DashboardGenerationRequest,
+                                 MultiStepWorkflowRequest,
+                                 UnderutilizationQuery)
+from src.models.responses import (AmazonQResponse, BedrockProcessingResponse,
+                                  DashboardResponse, QueryType,
+                                  WorkflowResponse, build_response,
+                                  create_model_response, create_response)
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(
+    prefix="/dashboard", tags=["Dashboard"], default_response_class=ORJSONResponse
+)
 
+# Banner separators for the workflow logs, built once rather than per log call
+_SEP = "=" * 80
+_STEP_SEP = "-" * 50
 
-@router.post("/generate", response_model=dict)
+# Query result entries also carry error/resource_type, which AmazonQResponse doesn't have
+_AMAZON_Q_RESPONSE_FIELDS = tuple(AmazonQResponse.model_fields)
+
+# Caps in-flight Amazon Q calls across workflows to stay under service throttling limits
+_amazon_q_semaphore = asyncio.Semaphore(max(1, settings.amazon_q_max_concurrency))
+
+
+async def _run_amazon_q_call(call: Callable[[], Awaitable[Dict]]) -> Dict:
+    """Run one Amazon Q call under the concurrency cap (results are memoized by the service)."""
+    async with _amazon_q_semaphore:
+        return await call()
+
+
+async def _deploy_dashboard(
+    dashboard_service,
+    s3_service,
+    site_id: str,
+    summary_data: Dict,
+    dashboard_type: str,
+    dashboard_name: Optional[str],
+    static_assets: Mapping[str, str],
+) -> str:
+    """
+    Render a dashboard and deploy it to S3, returning its public URL.
+    The static assets don't depend on the HTML, so they upload while it renders.
+    """
+
+    async def render_and_upload_html():
+        dashboard_html = await dashboard_service.create_dashboard(
+            summary_data=summary_data,
+            dashboard_type=dashboard_type,
+            dashboard_name=dashboard_name,
+        )
+        await s3_service.upload_html(dashboard_html, site_id)
+
+    await asyncio.gather(
+        s3_service.upload_assets(site_id, static_assets),
+        render_and_upload_html(),
+    )
+    await s3_service.configure_site_hosting()
+    return s3_service.get_site_url(site_id)
+
+
+async def _publish_dashboard_in_background(
+    s3_service, site_id: str, dashboard_html: str, static_assets: Mapping[str, str]
+) -> None:
+    """Upload a rendered dashboard after the response has been sent, logging failures."""
+    try:
+        await asyncio.gather(
+            s3_service.upload_html(dashboard_html, site_id),
+            s3_service.upload_assets(site_id, static_assets),
+        )
+        await s3_service.configure_site_hosting()
+        logger.info(f"Dashboard {site_id} deployed to S3")
+    except Exception as e:
+        logger.error(f"Background deployment of dashboard {site_id} failed: {e}")
+
+
+def _log_query_result(label: str, result) -> None:
+    """Log the shape of an Amazon Q result for workflow debugging."""
+    logger.info("✅ Query completed: %s", label)
+
+    # The structure dump walks the result, so only build it when DEBUG is on
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("🔍 WORKFLOW DEBUG - Amazon Q Result Structure:")
+    if isinstance(result, dict):
+        logger.debug("   Result keys: %s", list(result.keys()))
+        response_content = result.get("response", "NO_RESPONSE_KEY")
+        if isinstance(response_content, str):
+            logger.debug("   Response length: %d", len(response_content))
+        if isinstance(response_content, str) and response_content:
+            logger.debug("   Response preview: %s...", response_content[:200])
+        else:
+            logger.debug("   Response content: %r", response_content)
+    else:
+        logger.debug("   Raw result: %r", result)
+
+
+def _make_query_result(
+    original_query: str,
+    query_type: str,
+    resource_type: Optional[str],
+    outcome: Union[Dict, BaseException],
+    timestamp: str,
+) -> Dict:
+    """Build one amazon_q_results entry from a gathered query outcome."""
+    if isinstance(outcome, BaseException):
+        # One failed query shouldn't abort the rest of the workflow
+        logger.error(f"❌ Query failed ({original_query}): {outcome}")
+        entry = {
+            "query": original_query,
+            "response": f"Amazon Q query failed: {outcome}",
+            "conversation_id": None,
+            "source_attributions": [],
+            "timestamp": timestamp,
+            "query_type": query_type,
+            "error": str(outcome),
+        }
+    else:
+        _log_query_result(original_query, outcome)
+        entry = {
+            "query": original_query,
+            "response": outcome["response"],
+            "conversation_id": outcome.get("conversation_id"),
+            "source_attributions": outcome.get("source_attributions", []),
+            "timestamp": timestamp,
+            "query_type": query_type,
+        }
+    if resource_type:
+        entry["resource_type"] = resource_type
+    return entry
+
+
+# Targeted Amazon Q analysis per resource type: (label, query type, filter rules, analyzer call).
+# Filter rules turn keywords found in the query into analyzer filters.
+_RESOURCE_ANALYSES = {
+    "EC2": (
+        "EC2 underutilization analysis",
+        QueryType.EC2,
+        (
+            (("underutilized", "idle"), "low-cpu-utilization"),
+            (("development", "test"), "non-production"),
+        ),
+        lambda amazon_q, query, filters: amazon_q.analyze_ec2_underutilization(
+            time_range=query.time_range or "30d", instance_filters=filters
+        ),
+    ),
+    "EBS": (
+        "EBS underutilization analysis",
+        QueryType.EBS,
+        ((("unattached",), "unattached-volumes"), (("unused", "idle"), "low-iops")),
+        lambda amazon_q, query, filters: amazon_q.analyze_ebs_underutilization(
+            volume_filters=filters
+        ),
+    ),
+    "S3": (
+        "S3 underutilization analysis",
+        QueryType.S3,
+        (
+            (("empty", "unused"), "low-activity"),
+            (("old", "archive"), "lifecycle-optimization"),
+        ),
+        lambda amazon_q, query, filters: amazon_q.analyze_s3_underutilization(
+            bucket_filters=filters
+        ),
+    ),
+    "LAMBDA": (
+        "Lambda underutilization analysis",
+        QueryType.LAMBDA,
+        (
+            (("unused", "idle"), "low-invocation"),
+            (("memory", "size"), "over-provisioned"),
+        ),
+        lambda amazon_q, query, filters: amazon_q.analyze_lambda_underutilization(
+            function_filters=filters
+        ),
+    ),
+    "RDS": (
+        "RDS underutilization analysis",
+        QueryType.RDS,
+        (
+            (("underutilized", "idle"), "low-cpu"),
+            (("development", "test"), "non-production"),
+        ),
+        lambda amazon_q, query, filters: amazon_q.analyze_rds_underutilization(
+            instance_filters=filters
+        ),
+    ),
+}
+
+
+def _plan_resource_query(
+    amazon_q, query: CostOptimizationQuery, resource_type: str
+) -> Tuple[str, QueryType, Callable[[], Awaitable[Dict]]]:
+    """Pick the targeted Amazon Q analysis for one resource type of a query."""
+    resource = resource_type.upper()
+
+    analysis = _RESOURCE_ANALYSES.get(resource)
+    if analysis is not None:
+        label, query_type, filter_rules, analyze = analysis
+        query_text = query.query.lower()
+        filters = [
+            resource_filter
+            for keywords, resource_filter in filter_rules
+            if any(keyword in query_text for keyword in keywords)
+        ]
+        return (
+            f"{label} - {query.query}",
+            query_type,
+            partial(analyze, amazon_q, query, filters or None),
+        )
+
+    # Fallback to targeted cost optimization for other resource types
+    return (
+        f"{resource_type} cost optimization - {query.query}",
+        QueryType.COST_OPTIMIZATION,
+        partial(
+            amazon_q.query_cost_optimization,
+            query=f"{query.query} - Focus on {resource_type}",
+            focus_services=[resource],
+            resource_filters=["underutilization", "cost-optimization"],
+        ),
+    )
+
+
+def _plan_workflow_queries(
+    amazon_q, queries: List[Union[CostOptimizationQuery, UnderutilizationQuery]]
+) -> List[Tuple[str, QueryType, Optional[str], Callable[[], Awaitable[Dict]]]]:
+    """
+    Expand workflow queries into (original_query, query_type, resource_type, call)
+    entries, one per Amazon Q call, in request order.
+    """
+    planned = []
+    for query in queries:
+        if isinstance(query, CostOptimizationQuery):
+            if query.resource_types:
+                # Process each resource type specifically with targeted filtering
+                for resource_type in query.resource_types:
+                    original_query, query_type, call = _plan_resource_query(
+                        amazon_q, query, resource_type
+                    )
+                    planned.append(
+                        (original_query, query_type, resource_type.upper(), call)
+                    )
+            else:
+                # No specific resource types selected, use targeted cost optimization
+                planned.append(
+                    (
+                        query.query,
+                        QueryType.COST_OPTIMIZATION,
+                        None,
+                        partial(
+                            amazon_q.query_cost_optimization,
+                            query=query.query,
+                            focus_services=None,  # Will analyze common services
+                            resource_filters=["cost-optimization", "underutilization"],
+                        ),
+                    )
+                )
+        else:  # UnderutilizationQuery
+            planned.append(
+                (
+                    f"Underutilization analysis for {query.resource_type}",
+                    QueryType.UNDERUTILIZATION,
+                    None,
+                    partial(
+                        amazon_q.query_underutilization,
+                        resource_type=query.resource_type,
+                        time_range=query.time_range,
+                    ),
+                )
+            )
+
+    return planned
+
+
+@router.post("/generate")
 async def generate_dashboard(
     request: DashboardGenerationRequest,
+    background_tasks: BackgroundTasks,
     dashboard_service: DashboardServiceDep,
     s3_service: S3ServiceDep,
     config_valid: ConfigValidationDep,
@@ -29,54 +303,69 @@ async def generate_dashboard(
 
     This endpoint takes processed summary data and creates an interactive
     dashboard with charts and visualizations, then deploys it to S3 for
-    static web hosting.
+    static web hosting. The upload runs in the background, so the returned
+    URL becomes live shortly after the response.
     """
     try:
         logger.info(f"Generating {request.dashboard_type} dashboard")
 
-        # Generate dashboard HTML
-        dashboard_html = await dashboard_service.create_dashboard(
-            summary_data=request.summary_data, 
-            dashboard_type=request.dashboard_type,
-            dashboard_name=request.dashboard_name
-        )
-
         # Generate unique site ID with readable timestamp
-        readable_timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        generated_at = datetime.utcnow()
+        generated_iso = generated_at.isoformat()
+        readable_timestamp = generated_at.strftime("%Y%m%d_%H%M%S")
         dashboard_name = request.dashboard_name or "costAnalysis"
         site_id = f"{dashboard_name}_{readable_timestamp}"
 
         # Get additional static assets
         static_assets = dashboard_service.get_static_assets()
 
-        # Upload to S3
-        public_url = await s3_service.upload_static_site(
-            html_content=dashboard_html, site_id=site_id, additional_files=static_assets
+        # Render inline so template errors still fail the request
+        dashboard_html = await dashboard_service.create_dashboard(
+            summary_data=request.summary_data,
+            dashboard_type=request.dashboard_type,
+            dashboard_name=request.dashboard_name,
+        )
+
+        # The public URL is derived from the site ID, so the S3 upload can run after
+        # the response is sent; clients poll /list or the dashboard URL for readiness
+        public_url = s3_service.get_site_url(site_id)
+        background_tasks.add_task(
+            _publish_dashboard_in_background,
+            s3_service,
+            site_id,
+            dashboard_html,
+            static_assets,
         )
 
         # Create embed code
         embed_options = request.embed_options or {}
         width = embed_options.get("width", "100%")
         height = embed_options.get("height", "600px")
-        embed_code = await s3_service.create_embed_code(public_url, width, height)
+        embed_code = s3_service.create_embed_code(public_url, width, height)
 
         # Create response
-        response_data = DashboardResponse(
+        response_data = build_response(
+            DashboardResponse,
             dashboard_url=public_url,
             site_id=site_id,
             embed_code=embed_code,
             dashboard_type=request.dashboard_type,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=generated_iso,
             title=request.title,
             metadata={
                 "embed_options": embed_options,
                 "static_assets_count": len(static_assets),
+                "deployment_status": "pending",
             },
         )
 
-        return create_response(
-            data=response_data.dict(),
-            message=f"Dashboard generated and deployed successfully to {public_url}",
+        return Response(
+            create_model_response(
+                response_data,
+                message=f"Dashboard generated; deploying to {public_url}",
+                timestamp=generated_iso,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
@@ -84,7 +373,7 @@ async def generate_dashboard(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/workflow/complete", response_model=dict)
+@router.post("/workflow/complete")
 async def complete_workflow(
     request: MultiStepWorkflowRequest,
     amazon_q: AmazonQServiceDep,
@@ -103,251 +392,100 @@ async def complete_workflow(
     """
     start_time = datetime.utcnow()
     workflow_id = f"workflow-{uuid.uuid4().hex[:8]}"
+    # Every log line below (and in tasks spawned from here) is tagged by WorkflowIdFilter
+    workflow_token = workflow_id_var.set(workflow_id)
 
     # Log workflow start
-    logger.info("=" * 80)
+    logger.info(_SEP)
     logger.info("🚀 STARTING COMPLETE WORKFLOW")
-    logger.info("=" * 80)
-    logger.info(f"🆔 Workflow ID: {workflow_id}")
-    logger.info(f"📊 Number of queries: {len(request.amazon_q_queries)}")
-    logger.info(f"🎯 Processing type: {request.processing_type}")
-    logger.info(f"📅 Start time: {start_time}")
-    
+    logger.info(_SEP)
+    logger.info("📊 Number of queries: %d", len(request.amazon_q_queries))
+    logger.info("🎯 Processing type: %s", request.processing_type)
+    logger.info("📅 Start time: %s", start_time)
+
     # Log each query that will be processed
-    for i, query in enumerate(request.amazon_q_queries):
-        logger.info(f"🔍 Query {i+1}: {getattr(query, 'query', 'N/A')[:100]}...")
-        if hasattr(query, 'resource_types'):
-            logger.info(f"   Resource types: {getattr(query, 'resource_types', [])}")
-    logger.info("=" * 80)
+    for i, query in enumerate(request.amazon_q_queries, 1):
+        logger.info("🔍 Query %d: %.100s...", i, getattr(query, "query", "N/A"))
+        if hasattr(query, "resource_types"):
+            logger.info("   Resource types: %s", query.resource_types)
+    logger.info(_SEP)
 
     try:
-        logger.info(
-            f"Starting complete workflow {workflow_id} with {len(request.amazon_q_queries)} queries"
-        )
-
         # Step 1: Execute Amazon Q queries
         logger.info("📤 STEP 1: EXECUTING AMAZON Q QUERIES")
-        logger.info("-" * 50)
-        
-        amazon_q_results = []
-        for i, query in enumerate(request.amazon_q_queries):
-            logger.info(f"Processing query {i+1}/{len(request.amazon_q_queries)}")
-
-            if hasattr(query, "query"):  # CostOptimizationQuery
-                # Check if specific resource types are selected
-                if hasattr(query, "resource_types") and query.resource_types:
-                    # Process each resource type specifically with targeted filtering
-                    for resource_type in query.resource_types:
-                        logger.info(f"Processing specific resource type: {resource_type}")
-                        
-                        # Call the specific analysis endpoint based on resource type
-                        if resource_type.upper() == "EC2":
-                            # Extract any instance filters from the query
-                            instance_filters = []
-                            if "underutilized" in query.query.lower() or "idle" in query.query.lower():
-                                instance_filters.append("low-cpu-utilization")
-                            if "development" in query.query.lower() or "test" in query.query.lower():
-                                instance_filters.append("non-production")
-                            
-                            result = await amazon_q.analyze_ec2_underutilization(
-                                time_range=query.time_range or "30d",
-                                instance_filters=instance_filters if instance_filters else None
-                            )
-                            query_type = "ec2_analysis"
-                            original_query = f"EC2 underutilization analysis - {query.query}"
-                            
-                        elif resource_type.upper() == "EBS":
-                            # Extract volume filters from the query
-                            volume_filters = []
-                            if "unattached" in query.query.lower():
-                                volume_filters.append("unattached-volumes")
-                            if "unused" in query.query.lower() or "idle" in query.query.lower():
-                                volume_filters.append("low-iops")
-                                
-                            result = await amazon_q.analyze_ebs_underutilization(
-                                volume_filters=volume_filters if volume_filters else None
-                            )
-                            query_type = "ebs_analysis"
-                            original_query = f"EBS underutilization analysis - {query.query}"
-                            
-                        elif resource_type.upper() == "S3":
-                            # Extract bucket filters from the query
-                            bucket_filters = []
-                            if "empty" in query.query.lower() or "unused" in query.query.lower():
-                                bucket_filters.append("low-activity")
-                            if "old" in query.query.lower() or "archive" in query.query.lower():
-                                bucket_filters.append("lifecycle-optimization")
-                                
-                            result = await amazon_q.analyze_s3_underutilization(
-                                bucket_filters=bucket_filters if bucket_filters else None
-                            )
-                            query_type = "s3_analysis"
-                            original_query = f"S3 underutilization analysis - {query.query}"
-                            
-                        elif resource_type.upper() == "LAMBDA":
-                            # Extract function filters from the query
-                            function_filters = []
-                            if "unused" in query.query.lower() or "idle" in query.query.lower():
-                                function_filters.append("low-invocation")
-                            if "memory" in query.query.lower() or "size" in query.query.lower():
-                                function_filters.append("over-provisioned")
-                                
-                            result = await amazon_q.analyze_lambda_underutilization(
-                                function_filters=function_filters if function_filters else None
-                            )
-                            query_type = "lambda_analysis"
-                            original_query = f"Lambda underutilization analysis - {query.query}"
-                            
-                        elif resource_type.upper() == "RDS":
-                            # Extract RDS instance filters from the query
-                            instance_filters = []
-                            if "underutilized" in query.query.lower() or "idle" in query.query.lower():
-                                instance_filters.append("low-cpu")
-                            if "development" in query.query.lower() or "test" in query.query.lower():
-                                instance_filters.append("non-production")
-                                
-                            result = await amazon_q.analyze_rds_underutilization(
-                                instance_filters=instance_filters if instance_filters else None
-                            )
-                            query_type = "rds_analysis"
-                            original_query = f"RDS underutilization analysis - {query.query}"
-                        else:
-                            # Fallback to targeted cost optimization for other resource types
-                            result = await amazon_q.query_cost_optimization(
-                                query=f"{query.query} - Focus on {resource_type}",
-                                focus_services=[resource_type.upper()],
-                                resource_filters=["underutilization", "cost-optimization"]
-                            )
-                            query_type = "cost_optimization"
-                            original_query = f"{resource_type} cost optimization - {query.query}"
-
-                        # Log the result from Amazon Q with detailed debugging
-                        logger.info(f"✅ Query completed for {resource_type}")
-                        logger.info(f"🔍 WORKFLOW DEBUG - Amazon Q Result Structure:")
-                        logger.info(f"   Result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                        logger.info(f"   Result type: {type(result)}")
-                        if isinstance(result, dict):
-                            response_content = result.get('response', 'NO_RESPONSE_KEY')
-                            logger.info(f"   Response type: {type(response_content)}")
-                            logger.info(f"   Response length: {len(response_content) if isinstance(response_content, str) else 'Not a string'}")
-                            if isinstance(response_content, str) and response_content:
-                                logger.info(f"   Response preview: {response_content[:200]}...")
-                            else:
-                                logger.info(f"   Response content: {repr(response_content)}")
-                        else:
-                            logger.info(f"   Raw result: {repr(result)}")
-
-                        amazon_q_results.append({
-                            "query": original_query,
-                            "response": result["response"],
-                            "conversation_id": result.get("conversation_id"),
-                            "source_attributions": result.get("source_attributions", []),
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "query_type": query_type,
-                            "resource_type": resource_type.upper(),
-                        })
-                else:
-                    # No specific resource types selected, use targeted cost optimization
-                    result = await amazon_q.query_cost_optimization(
-                        query=query.query,
-                        focus_services=None,  # Will analyze common services
-                        resource_filters=["cost-optimization", "underutilization"]
-                    )
-                    query_type = "cost_optimization"
-                    original_query = query.query
-                    
-                    logger.info(f"✅ General cost optimization query completed")
-                    logger.info(f"🔍 WORKFLOW DEBUG - General Cost Optimization Result:")
-                    logger.info(f"   Result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                    if isinstance(result, dict):
-                        response_content = result.get('response', 'NO_RESPONSE_KEY')
-                        logger.info(f"   Response length: {len(response_content) if isinstance(response_content, str) else 'Not a string'}")
-                        if isinstance(response_content, str) and response_content:
-                            logger.info(f"   Response preview: {response_content[:200]}...")
-                        else:
-                            logger.info(f"   Response content: {repr(response_content)}")
-                    else:
-                        logger.info(f"   Raw result: {repr(result)}")
-                    
-                    amazon_q_results.append({
-                        "query": original_query,
-                        "response": result["response"],
-                        "conversation_id": result.get("conversation_id"),
-                        "source_attributions": result.get("source_attributions", []),
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "query_type": query_type,
-                    })
-            else:  # UnderutilizationQuery
-                result = await amazon_q.query_underutilization(
-                    resource_type=query.resource_type, time_range=query.time_range
-                )
-                query_type = "underutilization"
-                original_query = f"Underutilization analysis for {query.resource_type}"
-                
-                logger.info(f"✅ Underutilization query completed for {query.resource_type}")
-                logger.info(f"🔍 WORKFLOW DEBUG - Underutilization Result:")
-                logger.info(f"   Result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-                if isinstance(result, dict):
-                    response_content = result.get('response', 'NO_RESPONSE_KEY')
-                    logger.info(f"   Response length: {len(response_content) if isinstance(response_content, str) else 'Not a string'}")
-                    if isinstance(response_content, str) and response_content:
-                        logger.info(f"   Response preview: {response_content[:200]}...")
-                    else:
-                        logger.info(f"   Response content: {repr(response_content)}")
-                else:
-                    logger.info(f"   Raw result: {repr(result)}")
-                
-                amazon_q_results.append({
-                    "query": original_query,
-                    "response": result["response"],
-                    "conversation_id": result.get("conversation_id"),
-                    "source_attributions": result.get("source_attributions", []),
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "query_type": query_type,
-                })
+        logger.info(_STEP_SEP)
 
-        logger.info(f"📊 Completed {len(amazon_q_results)} Amazon Q queries")
-        logger.info(f"📏 Total response content: {sum(len(r['response']) for r in amazon_q_results)} characters")
+        # Queries are independent remote calls, so run them concurrently
+        planned = _plan_workflow_queries(amazon_q, request.amazon_q_queries)
+        outcomes = await asyncio.gather(
+            *(_run_amazon_q_call(call) for _, _, _, call in planned),
+            return_exceptions=True,
+        )
+
+        # Every query finished in the same gather, so they share one completion time
+        queries_completed_at = datetime.utcnow().isoformat()
+        # The plan fixes the result count, so build the list in a single pass
+        amazon_q_results = [
+            _make_query_result(
+                original_query, query_type, resource_type, outcome, queries_completed_at
+            )
+            for (original_query, query_type, resource_type, _), outcome in zip(
+                planned, outcomes
+            )
+        ]
+
+        failures = [o for o in outcomes if isinstance(o, BaseException)]
+        if failures and len(failures) == len(outcomes):
+            raise failures[0]
+
+        logger.info("📊 Completed %d Amazon Q queries", len(amazon_q_results))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📏 Total response content: %d characters",
+                sum(len(r["response"]) for r in amazon_q_results),
+            )
 
         # Step 2: Process through Bedrock agent
         logger.info("🤖 STEP 2: PROCESSING THROUGH BEDROCK AGENT")
-        logger.info("-" * 50)
-        
+        logger.info(_STEP_SEP)
+
         # Using existing agent from settings to avoid spinning up new ones
         bedrock_result = await bedrock.process_data_objects(
-            data_objects=amazon_q_results,
+            data_objects=[r for r in amazon_q_results if "error" not in r],
             agent_id=None,  # Use existing agent from settings.bedrock_agent_id
             agent_alias_id=None,  # Use existing alias from settings.bedrock_agent_alias_id
         )
 
         logger.info("✅ Bedrock processing completed")
-        logger.info(f"📏 Bedrock response length: {len(bedrock_result['response'])} characters")
+        logger.info("📏 Bedrock response length: %d characters", len(bedrock_result["response"]))
 
         # Step 3: Create dashboard summary optimized for React static serving
         logger.info("📊 STEP 3: CREATING DASHBOARD SUMMARY")
-        logger.info("-" * 50)
-        
+        logger.info(_STEP_SEP)
+
         dashboard_summary_result = await bedrock.create_dashboard_summary(
             processed_data=bedrock_result["response"],
             agent_id=None,  # Reuse existing agent - no new agent creation
             agent_alias_id=None,  # Reuse existing alias
         )
 
-        # Try to parse dashboard summary as JSON
-        try:
-            if isinstance(dashboard_summary_result["response"], str):
-                summary_data = json.loads(dashboard_summary_result["response"])
-            else:
-                summary_data = dashboard_summary_result["response"]
-                
+        # Try to parse dashboard summary as JSON; text that can't be an object skips the parser
+        raw_summary = dashboard_summary_result["response"]
+        summary_data = raw_summary
+        if isinstance(raw_summary, str) and raw_summary.lstrip().startswith("{"):
+            try:
+                summary_data = orjson.loads(raw_summary)
+            except orjson.JSONDecodeError:
+                pass
+
+        if isinstance(summary_data, dict):
             logger.info("✅ Dashboard summary parsed as JSON successfully")
-            logger.info(f"📊 Summary keys: {list(summary_data.keys()) if isinstance(summary_data, dict) else 'Not a dict'}")
-                
-        except (json.JSONDecodeError, KeyError):
+            logger.info("📊 Summary keys: %s", list(summary_data))
+        else:
             # If parsing fails, create a basic structure
             logger.warning("⚠️ Dashboard summary JSON parsing failed, using fallback structure")
             summary_data = {
-                "executive_summary": dashboard_summary_result["response"],
+                "executive_summary": raw_summary,
                 "recommendations": [],
                 "key_metrics": {},
                 "cost_savings": {},
@@ -355,104 +493,102 @@ async def complete_workflow(
 
         # Step 4: Generate dashboard
         logger.info("🎨 STEP 4: GENERATING DASHBOARD")
-        logger.info("-" * 50)
-        
+        logger.info(_STEP_SEP)
+
         dashboard_config = request.dashboard_config or {}
-        dashboard_type = dashboard_config.get("type", "cost_optimization")
+        dashboard_type = str(dashboard_config.get("type", "cost_optimization"))
         dashboard_name = dashboard_config.get("dashboard_name", "costAnalysis")
 
-        dashboard_html = await dashboard_service.create_dashboard(
-            summary_data=summary_data, 
-            dashboard_type=dashboard_type,
-            dashboard_name=dashboard_name
-        )
-
         # Deploy to S3 with human-readable naming
-        readable_timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        readable_timestamp = start_time.strftime("%Y%m%d_%H%M%S")
         site_id = f"{dashboard_name}_{readable_timestamp}"
         static_assets = dashboard_service.get_static_assets()
 
-        public_url = await s3_service.upload_static_site(
-            html_content=dashboard_html, site_id=site_id, additional_files=static_assets
+        public_url = await _deploy_dashboard(
+            dashboard_service,
+            s3_service,
+            site_id=site_id,
+            summary_data=summary_data,
+            dashboard_type=dashboard_type,
+            dashboard_name=dashboard_name,
+            static_assets=static_assets,
         )
 
-        embed_code = await s3_service.create_embed_code(public_url)
+        embed_code = s3_service.create_embed_code(public_url)
 
         # Calculate execution time
         end_time = datetime.utcnow()
+        end_iso = end_time.isoformat()
         execution_time = (end_time - start_time).total_seconds()
 
         logger.info("🎉 WORKFLOW COMPLETED SUCCESSFULLY!")
-        logger.info("=" * 80)
-        logger.info(f"🆔 Workflow ID: {workflow_id}")
-        logger.info(f"📊 Dashboard Name: {site_id}")
-        logger.info(f"⏱️ Total execution time: {execution_time:.2f} seconds")
-        logger.info(f"🌐 Dashboard URL: {public_url}")
-        logger.info(f"📊 Amazon Q queries: {len(amazon_q_results)}")
-        logger.info(f"🤖 Bedrock processing: ✅")
-        logger.info(f"📈 Dashboard generation: ✅")
-        logger.info("=" * 80)
-
-        # Create comprehensive response
-        response_data = WorkflowResponse(
+        logger.info(_SEP)
+        logger.info("📊 Dashboard Name: %s", site_id)
+        logger.info("⏱️ Total execution time: %.2f seconds", execution_time)
+        logger.info("🌐 Dashboard URL: %s", public_url)
+        logger.info("📊 Amazon Q queries: %d", len(amazon_q_results))
+        logger.info("🤖 Bedrock processing: ✅")
+        logger.info("📈 Dashboard generation: ✅")
+        logger.info(_SEP)
+
+        # Everything below was assembled server-side, so the models skip re-validation
+        response_data = build_response(
+            WorkflowResponse,
             workflow_id=workflow_id,
+            # model_construct would keep extra keys on the model, so pass only its fields
             amazon_q_results=[
-                {
-                    "query": result["query"],
-                    "response": result["response"],
-                    "conversation_id": result.get("conversation_id"),
-                    "source_attributions": result.get("source_attributions", []),
-                    "timestamp": result["timestamp"],
-                    "query_type": result["query_type"],
-                }
-                for result in amazon_q_results
+                build_response(
+                    AmazonQResponse,
+                    **{field: entry[field] for field in _AMAZON_Q_RESPONSE_FIELDS},
+                )
+                for entry in amazon_q_results
             ],
-            bedrock_processing={
-                "processed_data": bedrock_result["response"],
-                "processing_type": request.processing_type,
-                "session_id": f"session-{workflow_id}",
-                "timestamp": datetime.utcnow().isoformat(),
-                "metadata": {"input_queries_count": len(amazon_q_results)},
-            },
-            dashboard={
-                "dashboard_url": public_url,
-                "site_id": site_id,
-                "embed_code": embed_code,
-                "dashboard_type": dashboard_type,
-                "timestamp": datetime.utcnow().isoformat(),
-                "title": f"Cost Analysis Dashboard - {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC",
-                "metadata": dashboard_config,
-            },
+            bedrock_processing=build_response(
+                BedrockProcessingResponse,
+                processed_data=bedrock_result["response"],
+                processing_type=request.processing_type,
+                session_id=f"session-{workflow_id}",
+                timestamp=end_iso,
+                metadata={"input_queries_count": len(amazon_q_results)},
+            ),
+            dashboard=build_response(
+                DashboardResponse,
+                dashboard_url=public_url,
+                site_id=site_id,
+                embed_code=embed_code,
+                dashboard_type=dashboard_type,
+                timestamp=end_iso,
+                title=f"Cost Analysis Dashboard - {end_time.strftime('%Y-%m-%d %H:%M:%S')} UTC",
+                metadata=dashboard_config,
+            ),
             total_execution_time=execution_time,
-            timestamp=end_time.isoformat(),
+            timestamp=end_iso,
             status="completed",
         )
 
-        logger.info(
-            f"Workflow {workflow_id} completed successfully in {execution_time:.2f} seconds"
-        )
-        
-        return create_response(
-            data=response_data.dict(),
-            message=f"Cost Analysis Dashboard '{site_id}' generated successfully. Available at: {public_url}",
+        return Response(
+            create_model_response(
+                response_data,
+                message=f"Cost Analysis Dashboard '{site_id}' generated successfully. Available at: {public_url}",
+                timestamp=end_iso,
+            ),
+            media_type="application/json",
         )
 
     except Exception as e:
         logger.error("❌ WORKFLOW FAILED!")
-        logger.error("=" * 80)
-        logger.error(f"🆔 Workflow ID: {workflow_id}")
-        logger.error(f"❌ Error: {str(e)}")
-        logger.error(f"🕐 Failed at: {datetime.utcnow()}")
-        logger.error("=" * 80)
-        
-        # Log full traceback for debugging
-        import traceback
-        logger.error(f"Full traceback:\n{traceback.format_exc()}")
-        
+        logger.error(_SEP)
+        # logger.exception attaches the full traceback for debugging
+        logger.exception("❌ Error: %s", e)
+        logger.error("🕐 Failed at: %s", datetime.utcnow())
+        logger.error(_SEP)
+
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        workflow_id_var.reset(workflow_token)
 
 
-@router.get("/list", response_model=dict)
+@router.get("/list")
 async def list_dashboards(s3_service: S3ServiceDep, config_valid: ConfigValidationDep):
     """
     List all deployed dashboards.
@@ -465,13 +601,15 @@ async def list_dashboards(s3_service: S3ServiceDep, config_valid: ConfigValidati
 
         dashboards = await s3_service.list_dashboards()
 
-        return create_response(
-            data={
-                "dashboards": dashboards,
-                "total_count": len(dashboards),
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-            message=f"Retrieved {len(dashboards)} deployed dashboards",
+        return ORJSONResponse(
+            create_response(
+                data={
+                    "dashboards": dashboards,
+                    "total_count": len(dashboards),
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+                message=f"Retrieved {len(dashboards)} deployed dashboards",
+            )
         )
 
     except Exception as e:
@@ -479,7 +617,7 @@ async def list_dashboards(s3_service: S3ServiceDep, config_valid: ConfigValidati
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{site_id}/embed-code", response_model=dict)
+@router.get("/{site_id}/embed-code")
 async def get_embed_code(
     site_id: str,
     s3_service: S3ServiceDep,
@@ -497,24 +635,23 @@ async def get_embed_code(
         logger.info(f"Generating embed code for dashboard {site_id}")
 
         # Construct dashboard URL
-        if s3_service.use_website_endpoint:
-            dashboard_url = f"https://{s3_service.bucket_name}.s3-website-{s3_service.region}.amazonaws.com/{site_id}/index.html"
-        else:
-            dashboard_url = f"https://{s3_service.bucket_name}.s3.{s3_service.region}.amazonaws.com/{site_id}/index.html"
+        dashboard_url = s3_service.get_site_url(site_id)
 
         # Generate embed code
-        embed_code = await s3_service.create_embed_code(dashboard_url, width, height)
-
-        return create_response(
-            data={
-                "site_id": site_id,
-                "dashboard_url": dashboard_url,
-                "embed_code": embed_code,
-                "width": width,
-                "height": height,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-            message="Embed code generated successfully",
+        embed_code = s3_service.create_embed_code(dashboard_url, width, height)
+
+        return ORJSONResponse(
+            create_response(
+                data={
+                    "site_id": site_id,
+                    "dashboard_url": dashboard_url,
+                    "embed_code": embed_code,
+                    "width": width,
+                    "height": height,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+                message="Embed code generated successfully",
+            )
         )
 
     except Exception as e:
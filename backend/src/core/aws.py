@@ -0,0 +1,39 @@
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+from src.core.config import settings
+
+# Shared client defaults: bigger connection pool, TCP keep-alive, standard retries
+DEFAULT_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+
+
+@lru_cache()
+def get_boto_session() -> boto3.session.Session:
+    """Get the process-wide boto3 session, so service models are loaded only once."""
+    return boto3.session.Session(region_name=settings.aws_region)
+
+
+def _set_keep_alive_header(request, **kwargs):
+    """Ask the endpoint to keep the connection open for reuse."""
+    request.headers["Connection"] = "keep-alive"
+
+
+def create_client(
+    service_name: str,
+    region_name: str = None,
+    config: Config = None,
+    session: boto3.session.Session = None,
+):
+    """Create a boto3 client with pooled keep-alive connections from the shared session."""
+    session = session or get_boto_session()
+    client_config = DEFAULT_CLIENT_CONFIG.merge(config) if config else DEFAULT_CLIENT_CONFIG
+    client = session.client(service_name, region_name=region_name, config=client_config)
+    service_id = client.meta.service_model.service_id.hyphenize()
+    client.meta.events.register(f"request-created.{service_id}", _set_keep_alive_header)
+    return client
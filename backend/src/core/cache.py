@@ -0,0 +1,57 @@
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Keep cache lookups from stalling requests when Redis is slow or down
+REDIS_SOCKET_TIMEOUT = 1  # seconds
+
+
+@lru_cache()
+def get_redis() -> aioredis.Redis:
+    """Get the shared Redis client (connections are opened lazily from its pool)."""
+    return aioredis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password or None,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+
+
+def make_cache_key(prefix: str, *parts: Any) -> str:
+    """Build a stable cache key from arbitrary parts (hash() is randomized per process)."""
+    digest = hashlib.sha256("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f"{prefix}:{digest[:32]}"
+
+
+async def cached_json(key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+    """
+    Return the JSON value cached under key, computing and storing it on a miss.
+    Redis errors are logged and bypass the cache; failed computations are not cached.
+    """
+    client = get_redis()
+    try:
+        cached = await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return await compute()
+
+    if cached is not None:
+        return orjson.loads(cached)
+
+    value = await compute()
+    try:
+        await client.set(key, orjson.dumps(value), ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+    return value
@@ -1,6 +1,7 @@
 import secrets
 from typing import Optional
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -10,6 +11,7 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     debug: bool = False
     environment: str = "development"
+    enable_debug_routes: bool = False
 
     # AWS Configuration
     aws_region: str = "us-east-1"
@@ -18,12 +20,15 @@ class Settings(BaseSettings):
     aws_profile: Optional[str] = None
 
     # Amazon Q Developer CLI Configuration
-    amazon_q_cli_path: Optional[str] = None  # Path to Amazon Q CLI executable
+    amazon_q_cli_path: str = "q"  # Path to Amazon Q CLI executable
     amazon_q_default_region: str = "us-east-1"
     amazon_q_cli_timeout: int = 300  # CLI command timeout in seconds
     amazon_q_cli_max_retries: int = 3  # Maximum retry attempts
     amazon_q_cli_output_format: str = "json"  # Output format preference
     amazon_q_cli_working_dir: Optional[str] = None  # Working directory for CLI commands
+    amazon_q_max_concurrency: int = 8  # Max concurrent Amazon Q calls per workflow
+    amazon_q_cli_max_concurrency: int = 4  # Max concurrent Amazon Q CLI subprocesses
+    amazon_q_cache_enabled: bool = True  # Memoize Amazon Q CLI results in Redis
 
     # Amazon Q Configuration (legacy support)
     amazon_q_application_id: str = ""
@@ -46,7 +51,9 @@ class Settings(BaseSettings):
     s3_use_website_endpoint: bool = False  # Set to False to remove "website" from URLs
 
     # Security Configuration
-    secret_key: str = secrets.token_urlsafe(32)  # Auto-generate secure key if not provided
+    secret_key: str = Field(
+        default_factory=lambda: secrets.token_urlsafe(32)
+    )  # Auto-generate secure key only if not provided
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     allowed_origins: str = "http://localhost:3000,http://localhost:3001,http://127.0.0.1:3000"
@@ -86,6 +93,13 @@ class Settings(BaseSettings):
     feature_advanced_analytics: bool = True
     feature_async_processing: bool = True
 
+    @property
+    def cors_origins(self) -> tuple:
+        """Allowed CORS origins parsed from the comma-separated setting."""
+        return tuple(
+            origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()
+        )
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,23 @@
+import logging
+from contextvars import ContextVar
+
+# Workflow ID of the request being handled; tasks spawned by it inherit the value
+workflow_id_var: ContextVar[str] = ContextVar("workflow_id", default="-")
+
+# Default log line layout, tagged with the current workflow ID
+LOG_FORMAT = "%(levelname)s:%(name)s:[%(workflow_id)s] %(message)s"
+
+
+class WorkflowIdFilter(logging.Filter):
+    """Stamp each log record with the workflow ID from the current context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.workflow_id = workflow_id_var.get()
+        return True
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure root logging so every handler tags records with the workflow ID."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(WorkflowIdFilter())
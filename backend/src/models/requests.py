@@ -1,7 +1,35 @@
+import json
 import re
-from typing import Dict, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator
+import orjson
+from pydantic import (BaseModel, ConfigDict, Discriminator, Field, Tag,
+                      field_validator)
+from typing_extensions import TypedDict
+
+# Validator patterns, compiled once at import rather than looked up per request
+_QUERY_BAD_CHARS = re.compile(r'[<>"\']')
+_DASHBOARD_NAME_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
+# Units accepted after the number in a time range ("30d", "1w", ...)
+_TIME_RANGE_UNITS = frozenset("dhwmy")
+
+# Closed sets of request values, checked by pydantic-core rather than Python validators.
+# Resource types are upper-cased before the check.
+ResourceType = Literal[
+    "EC2", "RDS", "S3", "EBS", "LAMBDA", "ELB", "CLOUDFRONT", "ELASTICACHE"
+]
+ProcessingType = Literal["summary", "analysis", "report", "dashboard_summary"]
+DashboardType = Literal["cost_optimization", "utilization", "general"]
+
+# A data object must be a dict with at least one key; both checks run in pydantic-core
+NonEmptyDict = Annotated[Dict[str, Any], Field(min_length=1)]
+
+# Maximum total serialized size of a bulk processing payload
+BULK_DATA_SIZE_LIMIT = 1_000_000  # 1MB
+
+# Upper bound on bulk batches sent to Bedrock concurrently
+BULK_MAX_CONCURRENCY = 8
 
 
 class CostOptimizationQuery(BaseModel):
@@ -14,59 +42,70 @@ class CostOptimizationQuery(BaseModel):
     resource_types: List[str] = Field(
         default=[], description="Specific resource types to analyze"
     )
+    query_type: Literal["cost_optimization"] = Field(
+        "cost_optimization", description="Workflow query discriminator"
+    )
 
     @field_validator("query")
     @classmethod
     def validate_query(cls, v):
         # Remove potentially dangerous characters
-        if re.search(r'[<>"\']', v):
+        if _QUERY_BAD_CHARS.search(v):
             raise ValueError("Query contains invalid characters")
         return v.strip()
 
     @field_validator("time_range")
     @classmethod
     def validate_time_range(cls, v):
-        if v and not re.match(r"^\d+[dhwmy]$", v):
+        # Digits followed by one unit letter; a plain string check is cheaper than a regex
+        if v and not (v[-1] in _TIME_RANGE_UNITS and v[:-1].isdecimal()):
             raise ValueError(
                 "Time range must be in format like '30d', '7d', '1w', '1m', '1y'"
             )
         return v
 
 
+class ChatRequest(BaseModel):
+    message: str = Field(
+        ..., min_length=1, max_length=10000, description="Chat message for Amazon Q"
+    )
+    conversation_id: Optional[str] = Field(
+        None, description="Conversation ID for follow-up messages"
+    )
+
+    @field_validator("message")
+    @classmethod
+    def validate_message(cls, v):
+        # isspace() scans without allocating; only the returned value is stripped
+        if not v or v.isspace():
+            raise ValueError("Message cannot be empty")
+        return v.strip()
+
+
 class UnderutilizationQuery(BaseModel):
-    resource_type: str = Field(
+    resource_type: ResourceType = Field(
         ..., description="Type of resource to analyze (e.g., 'EC2', 'RDS', 'S3')"
     )
     time_range: Optional[str] = Field("30d", description="Time range for analysis")
     utilization_threshold: Optional[float] = Field(
         20.0, ge=0, le=100, description="Utilization threshold percentage"
     )
+    query_type: Literal["underutilization"] = Field(
+        "underutilization", description="Workflow query discriminator"
+    )
 
-    @field_validator("resource_type")
+    @field_validator("resource_type", mode="before")
     @classmethod
-    def validate_resource_type(cls, v):
-        allowed_types = [
-            "EC2",
-            "RDS",
-            "S3",
-            "EBS",
-            "Lambda",
-            "ELB",
-            "CloudFront",
-            "ElastiCache",
-        ]
-        if v.upper() not in allowed_types:
-            raise ValueError(
-                f"Resource type must be one of: {', '.join(allowed_types)}"
-            )
-        return v.upper()
+    def normalize_resource_type(cls, v):
+        # Only normalizes case; membership is checked by the Literal annotation
+        return v.upper() if isinstance(v, str) else v
 
 
 class BedrockProcessingRequest(BaseModel):
-    data_objects: List[Dict] = Field(
+    data_objects: List[NonEmptyDict] = Field(
         ..., min_length=1, description="List of data objects to process"
     )
-    processing_type: str = Field(
+    processing_type: ProcessingType = Field(
         ...,
         description="Type of processing to perform",
     )
@@ -77,30 +116,23 @@ class BedrockProcessingRequest(BaseModel):
         None, description="Override default Bedrock agent alias ID"
     )
 
-    @field_validator("data_objects")
-    @classmethod
-    def validate_data_objects(cls, v):
-        for i, obj in enumerate(v):
-            if not isinstance(obj, dict) or not obj:
-                raise ValueError(
-                    f"Data object at index {i} must be a non-empty dictionary"
-                )
-        return v
 
-    @field_validator("processing_type")
-    @classmethod
-    def validate_processing_type(cls, v):
-        allowed_types = ["summary", "analysis", "report", "dashboard_summary"]
-        if v not in allowed_types:
-            raise ValueError(f"Processing type must be one of: {', '.join(allowed_types)}")
-        return v
+class EmbedOptions(TypedDict, total=False):
+    """Options for embed code generation; unknown keys are rejected"""
+
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
+    width: Union[int, str]
+    height: Union[int, str]
+    frameborder: Union[int, str]
+    allowfullscreen: bool
 
 
 class DashboardGenerationRequest(BaseModel):
-    summary_data: Dict = Field(
+    summary_data: NonEmptyDict = Field(
         ..., description="Processed summary data for dashboard generation"
     )
-    dashboard_type: str = Field(
+    dashboard_type: DashboardType = Field(
         "cost_optimization",
         description="Type of dashboard to generate",
     )
@@ -110,55 +142,55 @@ class DashboardGenerationRequest(BaseModel):
     title: Optional[str] = Field(
         None, max_length=100, description="Custom dashboard title"
     )
-    embed_options: Optional[Dict] = Field(
+    embed_options: Optional[EmbedOptions] = Field(
         default={}, description="Options for embed code generation"
     )
 
-    @field_validator("summary_data")
-    @classmethod
-    def validate_summary_data(cls, v):
-        if not isinstance(v, dict) or not v:
-            raise ValueError("Summary data must be a non-empty dictionary")
-        return v
-
-    @field_validator("dashboard_type")
-    @classmethod
-    def validate_dashboard_type(cls, v):
-        allowed_types = ["cost_optimization", "utilization", "general"]
-        if v not in allowed_types:
-            raise ValueError(f"Dashboard type must be one of: {', '.join(allowed_types)}")
-        return v
-
-    @field_validator("embed_options")
-    @classmethod
-    def validate_embed_options(cls, v):
-        if v:
-            allowed_keys = ["width", "height", "frameborder", "allowfullscreen"]
-            for key in v.keys():
-                if key not in allowed_keys:
-                    raise ValueError(
-                        f"Invalid embed option: {key}. Allowed: {', '.join(allowed_keys)}"
-                    )
-        return v
-
     @field_validator("dashboard_name")
     @classmethod
     def validate_dashboard_name(cls, v):
         if v:
             # Remove invalid characters for use in URLs/filenames
-            import re
-            if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+            if not _DASHBOARD_NAME_RE.match(v):
                 raise ValueError("Dashboard name can only contain letters, numbers, underscores, and dashes")
         return v or "costAnalysis"
 
 
+def _workflow_query_type(v: Any) -> Optional[str]:
+    """
+    Pick the workflow query model from query_type, inferring it for clients that
+    omit the field: only underutilization queries carry a resource_type and no query.
+    """
+    if isinstance(v, dict):
+        query_type = v.get("query_type")
+        if query_type is None:
+            if "resource_type" in v and "query" not in v:
+                return "underutilization"
+            return "cost_optimization"
+        return query_type
+    return getattr(v, "query_type", None)
+
+
+# Validated by a single dispatch on query_type instead of trying each union member
+WorkflowQuery = Annotated[
+    Union[
+        Annotated[CostOptimizationQuery, Tag("cost_optimization")],
+        Annotated[UnderutilizationQuery, Tag("underutilization")],
+    ],
+    Discriminator(_workflow_query_type),
+]
+
+
 class MultiStepWorkflowRequest(BaseModel):
     """Complete workflow request combining all steps"""
 
-    amazon_q_queries: List[Union[CostOptimizationQuery, UnderutilizationQuery]] = Field(
-        ..., min_items=1, description="List of Amazon Q queries to execute"
+    amazon_q_queries: List[WorkflowQuery] = Field(
+        ...,
+        min_length=1,
+        max_length=10,
+        description="List of Amazon Q queries to execute (at most 10)",
     )
-    processing_type: str = Field(
+    processing_type: ProcessingType = Field(
         "analysis",
         description="Bedrock processing type",
     )
@@ -166,31 +198,31 @@ class MultiStepWorkflowRequest(BaseModel):
         default={}, description="Dashboard generation configuration"
     )
 
-    @field_validator("amazon_q_queries")
-    @classmethod
-    def validate_queries(cls, v):
-        if len(v) > 10:
-            raise ValueError("Maximum 10 queries allowed per workflow")
-        return v
 
-    @field_validator("processing_type")
-    @classmethod
-    def validate_processing_type_workflow(cls, v):
-        allowed_types = ["summary", "analysis", "report", "dashboard_summary"]
-        if v not in allowed_types:
-            raise ValueError(f"Processing type must be one of: {', '.join(allowed_types)}")
-        return v
+def _json_size(obj: Any) -> int:
+    """Length of the compact JSON encoding of obj."""
+    try:
+        return len(orjson.dumps(obj, default=str))
+    except orjson.JSONEncodeError:
+        # orjson rejects some valid JSON (integers beyond 64 bits, very deep nesting)
+        return len(json.dumps(obj, default=str, separators=(",", ":")))
 
 
 class BulkDataProcessingRequest(BaseModel):
     """For processing multiple data objects in bulk"""
 
-    data_objects: List[Dict] = Field(
+    data_objects: List[NonEmptyDict] = Field(
         ..., min_length=1, max_length=50, description="Bulk data objects to process"
     )
     batch_size: Optional[int] = Field(
         5, ge=1, le=10, description="Number of objects to process per batch"
     )
+    max_concurrency: int = Field(
+        BULK_MAX_CONCURRENCY,
+        ge=1,
+        le=BULK_MAX_CONCURRENCY,
+        description="Number of batches processed concurrently",
+    )
     processing_options: Optional[Dict] = Field(
         default={}, description="Additional processing options"
     )
@@ -198,9 +230,13 @@ class BulkDataProcessingRequest(BaseModel):
     @field_validator("data_objects")
     @classmethod
     def validate_bulk_data(cls, v):
-        total_size = sum(len(str(obj)) for obj in v)
-        if total_size > 1000000:  # 1MB limit
-            raise ValueError("Total data size exceeds 1MB limit")
+        # Runs after pydantic-core has checked every element is a non-empty dict
+        # Measure the compact JSON encoding and stop as soon as the limit is passed
+        total_size = 0
+        for obj in v:
+            total_size += _json_size(obj)
+            if total_size > BULK_DATA_SIZE_LIMIT:
+                raise ValueError("Total data size exceeds 1MB limit")
         return v
 
 
@@ -220,6 +256,7 @@ class DashboardSummaryRequest(BaseModel):
     @field_validator("processed_data")
     @classmethod
     def validate_processed_data(cls, v):
-        if not v.strip():
+        # Bedrock output can be large, so check for blank input without a stripped copy
+        if not v or v.isspace():
             raise ValueError("Processed data cannot be empty")
         return v.strip()
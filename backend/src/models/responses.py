@@ -1,10 +1,32 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from enum import StrEnum
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class AmazonQResponse(BaseModel):
+class QueryType(StrEnum):
+    """Amazon Q query identifiers (serialized as their string values)"""
+
+    COST_OPTIMIZATION = "cost_optimization"
+    UNDERUTILIZATION = "underutilization"
+    CHAT = "chat"
+    EC2 = "ec2_analysis"
+    EBS = "ebs_analysis"
+    S3 = "s3_analysis"
+    LAMBDA = "lambda_analysis"
+    RDS = "rds_analysis"
+    COMPREHENSIVE = "comprehensive_analysis"
+    DASHBOARD = "dashboard_creation"
+
+
+class ResponseModel(BaseModel):
+    """Base for response payloads: built once by the server, then only serialized"""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class AmazonQResponse(ResponseModel):
     query: str = Field(..., description="Original query")
     response: str = Field(..., description="Amazon Q response")
     conversation_id: Optional[str] = Field(
@@ -14,12 +36,12 @@ class AmazonQResponse(BaseModel):
         default=[], description="Source attributions from Amazon Q"
     )
     timestamp: str = Field(..., description="Response timestamp")
-    query_type: str = Field(
+    query_type: QueryType = Field(
         ..., description="Type of query (cost_optimization, underutilization)"
     )
 
 
-class BedrockProcessingResponse(BaseModel):
+class BedrockProcessingResponse(ResponseModel):
     processed_data: Union[str, Dict] = Field(
         ..., description="Processed data from Bedrock agent"
     )
@@ -31,7 +53,7 @@ class BedrockProcessingResponse(BaseModel):
     )
 
 
-class DashboardResponse(BaseModel):
+class DashboardResponse(ResponseModel):
     dashboard_url: str = Field(..., description="Public URL of the deployed dashboard")
     site_id: str = Field(..., description="Unique site identifier")
     embed_code: str = Field(..., description="HTML embed code for the dashboard")
@@ -41,7 +63,7 @@ class DashboardResponse(BaseModel):
     metadata: Optional[Dict] = Field(default={}, description="Dashboard metadata")
 
 
-class WorkflowResponse(BaseModel):
+class WorkflowResponse(ResponseModel):
     """Complete workflow response"""
 
     workflow_id: str = Field(..., description="Unique workflow identifier")
@@ -61,7 +83,7 @@ class WorkflowResponse(BaseModel):
     status: str = Field("completed", description="Workflow status")
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(ResponseModel):
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
     details: Optional[Dict] = Field(default={}, description="Additional error details")
@@ -69,7 +91,7 @@ class ErrorResponse(BaseModel):
     request_id: Optional[str] = Field(None, description="Request ID for tracking")
 
 
-class HealthCheckResponse(BaseModel):
+class HealthCheckResponse(ResponseModel):
     status: str = Field(..., description="Service health status")
     timestamp: str = Field(..., description="Health check timestamp")
     services: Dict[str, str] = Field(..., description="Status of dependent services")
@@ -77,13 +99,13 @@ class HealthCheckResponse(BaseModel):
     uptime: Optional[float] = Field(None, description="Service uptime in seconds")
 
 
-class DashboardListResponse(BaseModel):
+class DashboardListResponse(ResponseModel):
     dashboards: List[Dict] = Field(..., description="List of available dashboards")
     total_count: int = Field(..., description="Total number of dashboards")
     timestamp: str = Field(..., description="Response timestamp")
 
 
-class MetricsResponse(BaseModel):
+class MetricsResponse(ResponseModel):
     """API metrics and usage statistics"""
 
     total_queries: int = Field(..., description="Total number of queries processed")
@@ -98,7 +120,7 @@ class MetricsResponse(BaseModel):
     period: str = Field(..., description="Metrics period (e.g., '24h', '7d')")
 
 
-class AsyncTaskResponse(BaseModel):
+class AsyncTaskResponse(ResponseModel):
     """Response for asynchronous task submission"""
 
     task_id: str = Field(..., description="Unique task identifier")
@@ -110,7 +132,7 @@ class AsyncTaskResponse(BaseModel):
     timestamp: str = Field(..., description="Task submission timestamp")
 
 
-class TaskStatusResponse(BaseModel):
+class TaskStatusResponse(ResponseModel):
     """Response for task status check"""
 
     task_id: str = Field(..., description="Task identifier")
@@ -129,7 +151,7 @@ class TaskStatusResponse(BaseModel):
     )
 
 
-class ValidationErrorResponse(BaseModel):
+class ValidationErrorResponse(ResponseModel):
     """Response for validation errors"""
 
     error: str = Field("validation_error", description="Error type")
@@ -140,33 +162,68 @@ class ValidationErrorResponse(BaseModel):
     timestamp: str = Field(..., description="Error timestamp")
 
 
-class SuccessResponse(BaseModel):
+class SuccessResponse(ResponseModel):
     """Generic success response"""
 
     success: bool = Field(True, description="Operation success status")
     message: str = Field(..., description="Success message")
-    data: Optional[Dict] = Field(default={}, description="Response data")
+    data: Optional[Any] = Field(default={}, description="Response data")
     timestamp: str = Field(..., description="Response timestamp")
 
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Bound once so the response helpers skip the attribute lookup on every call
+_utcnow = datetime.utcnow
+
+
 # Utility function to create standardized responses
-def create_response(data: Any, message: str = "Success") -> Dict:
-    """Create a standardized API response"""
+def build_response(cls: Type[ModelT], **data: Any) -> ModelT:
+    """
+    Build a response model from server-assembled data without re-validating it.
+    Only use this for trusted values; nested models must be built (not passed as dicts).
+    """
+    return cls.model_construct(**data)
+
+
+def create_response(
+    data: Any, message: str = "Success", *, timestamp: Optional[str] = None
+) -> Dict:
+    """Create a standardized API response (pass timestamp to reuse the payload's)"""
     return {
         "success": True,
         "message": message,
         "data": data,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": timestamp or _utcnow().isoformat(),
     }
 
 
+def create_model_response(
+    data: BaseModel, message: str = "Success", *, timestamp: Optional[str] = None
+) -> str:
+    """Serialize a standardized API response around a model in a single pass"""
+    # The model is already validated, so the envelope skips validation and dict conversion
+    return build_response(
+        SuccessResponse,
+        success=True,
+        message=message,
+        data=data,
+        timestamp=timestamp or _utcnow().isoformat(),
+    ).model_dump_json()
+
+
 def create_error_response(
-    error_type: str, message: str, details: Optional[Dict] = None
+    error_type: str,
+    message: str,
+    details: Optional[Dict] = None,
+    *,
+    timestamp: Optional[str] = None,
 ) -> ErrorResponse:
     """Create a standardized error response"""
-    return ErrorResponse(
+    return build_response(
+        ErrorResponse,
         error=error_type,
         message=message,
         details=details or {},
-        timestamp=datetime.utcnow().isoformat(),
+        timestamp=timestamp or _utcnow().isoformat(),
     )
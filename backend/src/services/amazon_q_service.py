@@ -2,6 +2,8 @@ import asyncio
 import json
 import logging
 import os
+import re
+import signal
 import subprocess
 import time
 from functools import wraps
@@ -9,6 +11,7 @@ from typing import Dict, List, Optional
 
 from fastapi import HTTPException
 
+from src.core.cache import cached_json, make_cache_key
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,15 @@ CRITICAL READ-ONLY GUARDRAILS:
 - NO RESOURCE MODIFICATIONS: Do not modify, create, or delete any AWS resources
 - ANALYSIS ONLY: Provide analysis and recommendations without implementing changes"""
 
+# Bytes read per await when streaming CLI output; unlike readline(), any line length is accepted
+STREAM_READ_CHUNK_SIZE = 64 * 1024
+
+# Per-stream buffer before the pipe is paused; well above a chunk so bursts of output don't stall it
+STREAM_BUFFER_LIMIT = 1 << 20
+
+# Constraints prepended to every prompt sent to the Amazon Q CLI
+SAFETY_PROMPT_PREFIX = f"{READ_ONLY_SAFETY}\n{FAST_ANALYSIS_INSTRUCTIONS}\n\n"
+
 # List of explicitly allowed AWS CLI command prefixes (read-only operations)
 ALLOWED_AWS_CLI_COMMANDS = {
     'describe-', 'list-', 'get-', 'show-', 'select-', 'query-', 'scan-',
@@ -92,6 +104,105 @@ RESPONSE FORMAT REQUIREMENTS:
 
 ABSOLUTELY CRITICAL: The downstream dashboard system needs maximum detail to create meaningful visualizations and actionable insights. Provide exhaustive analysis rather than summaries."""
 
+# Safety patterns, compiled once at import instead of on every CLI call.
+# Each check is a single alternation, so the regex engine scans the text once.
+# Longest commands first, so a command is never shadowed by one of its prefixes
+_FORBIDDEN_CMD_ALT = "|".join(
+    re.escape(cmd) for cmd in sorted(FORBIDDEN_AWS_CLI_COMMANDS, key=len, reverse=True)
+)
+
+# Forbidden commands in generated scripts: with an aws prefix or as a standalone word
+_FORBIDDEN_SCRIPT_RE = re.compile(
+    rf"\baws\s+\S*({_FORBIDDEN_CMD_ALT})|\b({_FORBIDDEN_CMD_ALT})\b"
+)
+
+# Forbidden commands in prompts: as an aws subcommand, at the start, or after whitespace
+_FORBIDDEN_PROMPT_RE = re.compile(
+    rf"\baws\s+\w+\s+({_FORBIDDEN_CMD_ALT})"
+    rf"|^({_FORBIDDEN_CMD_ALT})\b"
+    rf"|\s({_FORBIDDEN_CMD_ALT})\b"
+)
+
+# Dangerous shell commands; the pattern text is reported on a match
+DANGEROUS_COMMAND_PATTERNS = (
+    r'\brm\s+', r'\bmv\s+', r'\bcp\s+(?!--dryrun)', r'\bchmod\s+\+x', r'\bsudo\b',
+    r'\bcurl\s+-X\s+POST', r'\bcurl\s+-X\s+PUT', r'\bcurl\s+-X\s+DELETE',
+    r'\bcurl\s+-X\s+PATCH', r'\bwget\s+--post', r'\bterraform\s+apply',
+    r'\bterraform\s+destroy', r'\bkubectl\s+apply', r'\bkubectl\s+delete',
+    r'\bdocker\s+run\s+-d',
+)
+
+# Shell write operations; the pattern text is reported on a match
+WRITE_OPERATION_PATTERNS = (
+    r'\s>\s', r'\s>>', r'\btee\s+', r'\becho\s+>', r'\bprintf\s+>',
+    r'\bcat\s+>', r'\bwrite\b', r'\bmodify\b',
+)
+
+
+def _compile_alternation(patterns: tuple) -> re.Pattern:
+    """Fuse patterns into one regex whose match.lastgroup ("p<index>") names the hit."""
+    return re.compile("|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(patterns)))
+
+
+_DANGEROUS_COMMAND_RE = _compile_alternation(DANGEROUS_COMMAND_PATTERNS)
+_WRITE_OPERATION_RE = _compile_alternation(WRITE_OPERATION_PATTERNS)
+
+
+def _matched_command(match: re.Match) -> str:
+    """Return the forbidden command captured by whichever context matched."""
+    return next(group for group in match.groups() if group)
+
+
+def _matched_pattern(match: re.Match, patterns: tuple) -> str:
+    """Return the source text of the fused pattern that matched."""
+    return patterns[int(match.lastgroup[1:])]
+
+# CLI parameters (--flag or --flag value), stripped before prompt validation
+_CLI_PARAM_STRIP = re.compile(r'--[\w-]+(?:\s+[^\s-][^\s]*)?')
+
+# Terminal color/control sequences emitted by the Amazon Q CLI
+_ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Three or more consecutive (possibly whitespace-only) lines
+_EXTRA_BLANK_LINES = re.compile(r'\n\s*\n\s*\n')
+
+# Output-parsing patterns: each alternation replaces a per-line any(... in line) scan
+_RESPONSE_START_RE = re.compile("|".join(map(re.escape, (
+    "> I'll help", "> I'll analyze", "> Let me help", "> Let's analyze",
+    "> I can help", "> I'll assist", "> I'm analyzing", "> I'll start",
+))))
+_RESPONSE_SKIP_RE = re.compile(
+    "Command exited with code|Execution finished|CLI completed"
+)
+_MEANINGFUL_LINE_RE = re.compile(
+    "analyze|help|check|instances|resources|costs|optimization", re.IGNORECASE
+)
+_RAW_OUTPUT_ARTIFACTS_RE = re.compile(
+    "Command exited with code|Execution finished in|Exit code:|Process completed"
+)
+
+# Parsed responses shorter than this trigger the fallback parsing methods
+MIN_PARSED_RESPONSE_LENGTH = 200
+
+
+def _decode_output_lines(chunks: List[bytes]) -> List[str]:
+    """Decode streamed CLI output in one pass and return its non-empty lines."""
+    text = b"".join(chunks).decode('utf-8', 'replace')
+    return [line for line in (raw.rstrip('\r') for raw in text.split("\n")) if line]
+
+
+def _minimal_clean(output: str) -> str:
+    """Last-resort cleanup: drop obvious CLI artifacts and collapse blank lines."""
+    # Only remove obvious CLI artifacts from the minimal cleaning
+    output = _RAW_OUTPUT_ARTIFACTS_RE.sub("", output)
+
+    # Clean up multiple newlines
+    return _EXTRA_BLANK_LINES.sub('\n\n', output).strip()
+
+
+# Directories prepended to PATH (when missing) so the Q and AWS CLIs resolve
+CLI_PATH_DIRS = ("/root/.local/bin", "/usr/local/bin", "/usr/bin", "/bin")
+
 
 def validate_script_safety(script_content: str) -> tuple[bool, str]:
     """
@@ -104,40 +215,21 @@ def validate_script_safety(script_content: str) -> tuple[bool, str]:
     script_lower = script_content.lower()
     
     # Check for forbidden AWS CLI commands with word boundaries
-    import re
-    for forbidden_cmd in FORBIDDEN_AWS_CLI_COMMANDS:
-        # Create pattern that matches the command as a whole word or with aws prefix
-        patterns = [
-            rf'\baws\s+\S*{re.escape(forbidden_cmd)}',  # aws s3 rm, aws ec2 terminate-instances, etc.
-            rf'\b{re.escape(forbidden_cmd)}\b'  # standalone command like rm, mv, etc.
-        ]
-        
-        for pattern in patterns:
-            if re.search(pattern, script_lower):
-                return False, f"Forbidden AWS CLI command detected: {forbidden_cmd}"
+    match = _FORBIDDEN_SCRIPT_RE.search(script_lower)
+    if match:
+        return False, f"Forbidden AWS CLI command detected: {_matched_command(match)}"
     
     # Check for dangerous shell commands with word boundaries
-    dangerous_commands = [
-        r'\brm\s+', r'\bmv\s+', r'\bcp\s+(?!--dryrun)', r'\bchmod\s+\+x', r'\bsudo\b',
-        r'\bcurl\s+-X\s+POST', r'\bcurl\s+-X\s+PUT', r'\bcurl\s+-X\s+DELETE', 
-        r'\bcurl\s+-X\s+PATCH', r'\bwget\s+--post', r'\bterraform\s+apply',
-        r'\bterraform\s+destroy', r'\bkubectl\s+apply', r'\bkubectl\s+delete', 
-        r'\bdocker\s+run\s+-d'
-    ]
-    
-    for dangerous_pattern in dangerous_commands:
-        if re.search(dangerous_pattern, script_lower):
-            return False, f"Potentially dangerous command detected: {dangerous_pattern}"
+    match = _DANGEROUS_COMMAND_RE.search(script_lower)
+    if match:
+        dangerous_pattern = _matched_pattern(match, DANGEROUS_COMMAND_PATTERNS)
+        return False, f"Potentially dangerous command detected: {dangerous_pattern}"
     
     # Check for write operations in script with word boundaries
-    write_patterns = [
-        r'\s>\s', r'\s>>', r'\btee\s+', r'\becho\s+>', r'\bprintf\s+>', 
-        r'\bcat\s+>', r'\bwrite\b', r'\bmodify\b'
-    ]
-    
-    for write_pattern in write_patterns:
-        if re.search(write_pattern, script_lower):
-            return False, f"Write operation detected: {write_pattern}"
+    match = _WRITE_OPERATION_RE.search(script_lower)
+    if match:
+        write_pattern = _matched_pattern(match, WRITE_OPERATION_PATTERNS)
+        return False, f"Write operation detected: {write_pattern}"
     
     return True, ""
 
@@ -169,28 +261,108 @@ class AmazonQService:
             aws_profile or "rnd"
         )  # Default to rnd profile as per user's setup
         self.region = region
-        self.timeout = getattr(settings, "amazon_q_cli_timeout", 300)
-        self.max_retries = getattr(settings, "amazon_q_cli_max_retries", 3)
-        self.working_dir = getattr(settings, "amazon_q_cli_working_dir", None)
+        self.timeout = settings.amazon_q_cli_timeout
+        self.max_retries = settings.amazon_q_cli_max_retries
+        self.working_dir = settings.amazon_q_cli_working_dir
+        self.max_concurrency = max(1, settings.amazon_q_cli_max_concurrency)
+        # Shared by every caller of this service so parallel queries can't fork-storm the host
+        self._cli_semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Static part of the CLI environment, built once instead of on every attempt
+        self._base_env = self._build_base_env()
+        self._cli_checked = False
+
+    def _log_cli_status(self) -> None:
+        """Log whether the CLI executable exists and its permissions (once per service)."""
+        try:
+            cli_stat = os.stat(self.cli_path)
+        except OSError:
+            logger.info("CLI file exists: False")
+        else:
+            logger.info("CLI file exists: True")
+            logger.info(f"CLI permissions: {oct(cli_stat.st_mode)}")
+        self._cli_checked = True
+
+    def _build_base_env(self) -> Dict[str, str]:
+        """Build the CLI environment shared by every command (credentials are added per call)."""
+        env = os.environ.copy()
+
+        # Ensure essential environment variables are set
+        env["HOME"] = "/root"
+        env["USER"] = "root"
+
+        # Named profiles get their credentials injected per call (see _cli_env)
+        if self.aws_profile == "default":
+            # For default profile, still set AWS_PROFILE for clarity
+            env["AWS_PROFILE"] = self.aws_profile
+
+        if self.region:
+            env["AWS_REGION"] = self.region
+            env["AWS_DEFAULT_REGION"] = self.region
+
+        # Ensure PATH includes both Q CLI and AWS CLI directories
+        path = env.get("PATH", "")
+        for component in CLI_PATH_DIRS:
+            if component not in path.split(":"):
+                path = f"{component}:{path}" if path else component
+        env["PATH"] = path
+
+        # Set AWS CLI configuration
+        env["AWS_CLI_AUTO_PROMPT"] = "off"
+        env["AWS_PAGER"] = ""
+        return env
+
+    def _cli_env(self) -> Dict[str, str]:
+        """Return the environment for one CLI command, with fresh profile credentials."""
+        if not self.aws_profile or self.aws_profile == "default":
+            return self._base_env
+
+        # CRITICAL FIX: Amazon Q CLI doesn't respect AWS_PROFILE env var
+        # Instead, we need to get session credentials from the RND profile and use them directly
+        env = dict(self._base_env)
+        try:
+            logger.info(f"Getting session credentials for profile: {self.aws_profile}")
+            # Use AWS STS to get temporary credentials from the specified profile
+            import boto3
+            session = boto3.Session(profile_name=self.aws_profile)
+            credentials = session.get_credentials()
+
+            if credentials:
+                # Set AWS credentials directly as environment variables
+                env["AWS_ACCESS_KEY_ID"] = credentials.access_key
+                env["AWS_SECRET_ACCESS_KEY"] = credentials.secret_key
+                if credentials.token:
+                    env["AWS_SESSION_TOKEN"] = credentials.token
+                logger.info(f"Successfully set credentials for profile: {self.aws_profile}")
+            else:
+                logger.warning(f"Could not get credentials for profile: {self.aws_profile}, falling back to default")
+        except Exception as e:
+            logger.warning(f"Failed to get credentials for profile {self.aws_profile}: {e}, falling back to default")
+        return env
 
     async def _run_cli_command(
-        self, prompt: str, model: str = "claude-3.5-sonnet", max_retries: int = None
+        self,
+        prompt: str,
+        model: str = "claude-3.5-sonnet",
+        max_retries: int = None,
+        use_cache: bool = True,
     ) -> str:
-        """Run Amazon Q CLI command with retry mechanism and return the output."""
+        """
+        Run Amazon Q CLI command with retry mechanism and return the output.
+        Identical prompts for the same model are memoized in Redis unless use_cache is False.
+        """
         
-        # Log the query being sent to Amazon Q
-        logger.info("=" * 60)
-        logger.info("📤 SENDING QUERY TO AMAZON Q:")
-        logger.info("=" * 60)
-        logger.info(f"🤖 Model: {model}")
-        logger.info(f"📏 Query length: {len(prompt)} characters")
-        logger.info(f"📄 Query preview (first 500 chars):")
-        logger.info(prompt[:500] + "..." if len(prompt) > 500 else prompt)
-        logger.info("=" * 60)
+        # Log the query being sent to Amazon Q (debug only, previews are large)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=" * 60)
+            logger.debug("📤 SENDING QUERY TO AMAZON Q:")
+            logger.debug("=" * 60)
+            logger.debug(f"🤖 Model: {model}")
+            logger.debug(f"📏 Query length: {len(prompt)} characters")
+            logger.debug(f"📄 Query preview (first 500 chars):")
+            logger.debug(prompt[:500] + "..." if len(prompt) > 500 else prompt)
+            logger.debug("=" * 60)
         
         max_retries = max_retries or self.max_retries
-        retry_count = 0
-        last_exception = None
 
         # Input validation for security
         if not prompt or not isinstance(prompt, str):
@@ -205,30 +377,19 @@ class AmazonQService:
         prompt_lower = prompt.lower()
 
         # Check for forbidden AWS CLI commands (but allow CLI parameters like --start-time)
-        import re
-        
         # First, remove all CLI parameters (--word or --word-word) from the text for validation
-        cleaned_prompt = re.sub(r'--[\w-]+(?:\s+[^\s-][^\s]*)?', '', prompt_lower)
+        cleaned_prompt = _CLI_PARAM_STRIP.sub('', prompt_lower)
         
-        for forbidden_cmd in FORBIDDEN_AWS_CLI_COMMANDS:
-            # Create pattern that matches actual AWS CLI commands, not parameters
-            patterns = [
-                rf'\baws\s+\w+\s+{re.escape(forbidden_cmd)}',  # aws ec2 terminate-instances, etc.
-                rf'^{re.escape(forbidden_cmd)}\b',  # standalone command at start of line
-                rf'\s{re.escape(forbidden_cmd)}\b',  # standalone command with word boundary
-            ]
-            
-            for pattern in patterns:
-                if re.search(pattern, cleaned_prompt):
-                    logger.error(f"Forbidden operation detected in prompt: {forbidden_cmd}")
-                    raise ValueError(f"Forbidden operation detected in prompt: {forbidden_cmd}")
+        # Matches actual AWS CLI commands, not parameters
+        match = _FORBIDDEN_PROMPT_RE.search(cleaned_prompt)
+        if match:
+            forbidden_cmd = _matched_command(match)
+            logger.error(f"Forbidden operation detected in prompt: {forbidden_cmd}")
+            raise ValueError(f"Forbidden operation detected in prompt: {forbidden_cmd}")
         
         # Add concise safety constraints to the prompt
         logger.info("Adding safety constraints to Amazon Q prompt")
-        enhanced_prompt = f"""{READ_ONLY_SAFETY}
-{FAST_ANALYSIS_INSTRUCTIONS}
-
-{prompt}"""
+        enhanced_prompt = SAFETY_PROMPT_PREFIX + prompt
 
         # Validate CLI path
         if (
@@ -238,76 +399,44 @@ class AmazonQService:
         ):
             raise ValueError("Invalid CLI path configuration")
 
+        if not (use_cache and settings.amazon_q_cache_enabled):
+            return await self._run_cli_with_retries(enhanced_prompt, model, max_retries)
+
+        # Only successful runs are cached, so failures are retried on the next request
+        return await cached_json(
+            make_cache_key("amazon_q_cli", model, enhanced_prompt),
+            lambda: self._run_cli_with_retries(enhanced_prompt, model, max_retries),
+            settings.cache_ttl_short,
+        )
+
+    async def _run_cli_with_retries(
+        self, enhanced_prompt: str, model: str, max_retries: int
+    ) -> str:
+        """Run the Amazon Q CLI on an already validated prompt, retrying with backoff."""
+        retry_count = 0
+        last_exception = None
+
+        env = self._cli_env()
+
+        # Debug logging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Environment HOME: {env.get('HOME')}")
+            logger.debug(f"Environment USER: {env.get('USER')}")
+            logger.debug(f"Environment AWS_PROFILE: {env.get('AWS_PROFILE', 'Not set')}")
+            logger.debug(f"Environment AWS_REGION: {env.get('AWS_REGION')}")
+            logger.debug(f"AWS Credentials Set: {bool(env.get('AWS_ACCESS_KEY_ID'))}")
+            logger.debug(f"CLI path: {self.cli_path}")
+            logger.debug(f"Working directory: {self.working_dir}")
+
+        # The CLI path never changes, so it is only inspected on the first command
+        if not self._cli_checked:
+            self._log_cli_status()
+
+        # Set working directory to a script-friendly location if not specified
+        working_dir = self.working_dir or os.getcwd()
+
         while retry_count < max_retries:
             try:
-                # Prepare environment with all necessary variables
-                env = os.environ.copy()
-                
-                # Ensure essential environment variables are set
-                env["HOME"] = "/root"
-                env["USER"] = "root"
-                
-                # CRITICAL FIX: Amazon Q CLI doesn't respect AWS_PROFILE env var
-                # Instead, we need to get session credentials from the RND profile and use them directly
-                if self.aws_profile and self.aws_profile != "default":
-                    try:
-                        logger.info(f"Getting session credentials for profile: {self.aws_profile}")
-                        # Use AWS STS to get temporary credentials from the specified profile
-                        import boto3
-                        session = boto3.Session(profile_name=self.aws_profile)
-                        credentials = session.get_credentials()
-                        
-                        if credentials:
-                            # Set AWS credentials directly as environment variables
-                            env["AWS_ACCESS_KEY_ID"] = credentials.access_key
-                            env["AWS_SECRET_ACCESS_KEY"] = credentials.secret_key
-                            if credentials.token:
-                                env["AWS_SESSION_TOKEN"] = credentials.token
-                            logger.info(f"Successfully set credentials for profile: {self.aws_profile}")
-                        else:
-                            logger.warning(f"Could not get credentials for profile: {self.aws_profile}, falling back to default")
-                    except Exception as e:
-                        logger.warning(f"Failed to get credentials for profile {self.aws_profile}: {e}, falling back to default")
-                else:
-                    # For default profile, still set AWS_PROFILE for clarity
-                    if self.aws_profile:
-                        env["AWS_PROFILE"] = self.aws_profile
-                
-                if self.region:
-                    env["AWS_REGION"] = self.region
-                    env["AWS_DEFAULT_REGION"] = self.region
-                
-                # Ensure PATH includes both Q CLI and AWS CLI directories
-                path_components = ["/root/.local/bin", "/usr/local/bin", "/usr/bin", "/bin"]
-                current_path = env.get("PATH", "")
-                for component in path_components:
-                    if component not in current_path:
-                        env["PATH"] = f"{component}:{env.get('PATH', '')}"
-                
-                # Set AWS CLI configuration
-                env["AWS_CLI_AUTO_PROMPT"] = "off"
-                env["AWS_PAGER"] = ""
-
-                # Debug logging
-                logger.info(f"Environment HOME: {env.get('HOME')}")
-                logger.info(f"Environment USER: {env.get('USER')}")
-                logger.info(f"Environment AWS_PROFILE: {env.get('AWS_PROFILE', 'Not set')}")
-                logger.info(f"Environment AWS_REGION: {env.get('AWS_REGION')}")
-                logger.info(f"AWS Credentials Set: {bool(env.get('AWS_ACCESS_KEY_ID'))}")
-                logger.info(f"CLI path: {self.cli_path}")
-                logger.info(f"Working directory: {self.working_dir}")
-                
-                # Set working directory to a script-friendly location if not specified
-                working_dir = self.working_dir or os.getcwd()
-                
-                # Additional debug: check if CLI exists
-                cli_exists = os.path.exists(self.cli_path)
-                logger.info(f"CLI file exists: {cli_exists}")
-                if cli_exists:
-                    import stat
-                    cli_stat = os.stat(self.cli_path)
-                    logger.info(f"CLI permissions: {oct(cli_stat.st_mode)}")
-
                 # Construct command with --no-interactive and --trust-all-tools flags
                 # Use list of strings to prevent shell injection
                 cmd = [
@@ -329,52 +458,81 @@ class AmazonQService:
                         f"Running Amazon Q CLI command: {' '.join(cmd[:4])} [prompt hidden]"
                     )
 
-                # Run command with live output streaming
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=env,
-                    cwd=working_dir,
-                )
+                # Cap concurrent CLI subprocesses; retries back off outside the limit
+                async with self._cli_semaphore:
+                    # Run command with live output streaming
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                        env=env,
+                        cwd=working_dir,
+                        limit=STREAM_BUFFER_LIMIT,
+                        # Own process group, so a timeout also kills the aws CLI children it spawns
+                        start_new_session=True,
+                    )
 
-                # Collect output while streaming to logs
-                stdout_lines = []
-                stderr_lines = []
+                    # Collect raw output chunks; they are decoded once the process exits
+                    stdout_chunks = []
+                    stderr_chunks = []
                 
-                async def read_stream(stream, lines_list, stream_name):
-                    """Read from stream line by line and log immediately."""
-                    while True:
-                        try:
-                            line = await stream.readline()
-                            if not line:
+                    async def read_stream(stream, chunks, stream_name):
+                        """Read from stream in large chunks, logging complete lines when debugging."""
+                        # Per-line logging is debug only; a summary is logged once the process exits
+                        log_lines = logger.isEnabledFor(logging.DEBUG)
+
+                        def log_line(raw_line: bytes):
+                            line_str = raw_line.decode('utf-8', 'replace').rstrip('\r')
+                            if line_str:  # Skip empty lines
+                                logger.debug(f"Amazon Q {stream_name}: {line_str}")
+
+                        # Holds the trailing partial line between chunks (only tracked for logging)
+                        pending = b""
+                        while True:
+                            try:
+                                chunk = await stream.read(STREAM_READ_CHUNK_SIZE)
+                            except Exception as e:
+                                logger.error(f"Error reading {stream_name}: {e}")
                                 break
-                            
-                            line_str = line.decode('utf-8').rstrip('\n\r')
-                            if line_str:  # Only log non-empty lines
-                                logger.info(f"Amazon Q {stream_name}: {line_str}")
-                                lines_list.append(line_str)
-                        except Exception as e:
-                            logger.error(f"Error reading {stream_name}: {e}")
-                            break
-
-                # Start streaming tasks
-                stdout_task = asyncio.create_task(read_stream(process.stdout, stdout_lines, "stdout"))
-                stderr_task = asyncio.create_task(read_stream(process.stderr, stderr_lines, "stderr"))
-
-                try:
-                    # Wait for process completion and stream reading with timeout
-                    await asyncio.wait_for(
-                        asyncio.gather(process.wait(), stdout_task, stderr_task),
-                        timeout=self.timeout
-                    )
-                except asyncio.TimeoutError:
-                    logger.error("Amazon Q CLI command timed out")
-                    process.kill()
-                    stdout_task.cancel()
-                    stderr_task.cancel()
-                    await process.wait()
-                    raise Exception("Amazon Q CLI command timed out")
+                            if not chunk:
+                                break
+
+                            chunks.append(chunk)
+                            if log_lines:
+                                *complete_lines, pending = (pending + chunk).split(b"\n")
+                                for raw_line in complete_lines:
+                                    log_line(raw_line)
+
+                        # Output that doesn't end with a newline is still a line
+                        if pending:
+                            log_line(pending)
+
+                    # Start streaming tasks
+                    stdout_task = asyncio.create_task(read_stream(process.stdout, stdout_chunks, "stdout"))
+                    stderr_task = asyncio.create_task(read_stream(process.stderr, stderr_chunks, "stderr"))
+
+                    try:
+                        # Wait for process completion and stream reading with timeout
+                        await asyncio.wait_for(
+                            asyncio.gather(process.wait(), stdout_task, stderr_task),
+                            timeout=self.timeout
+                        )
+                    except asyncio.TimeoutError:
+                        logger.error("Amazon Q CLI command timed out")
+                        try:
+                            os.killpg(process.pid, signal.SIGKILL)
+                        except ProcessLookupError:
+                            pass  # Already exited
+                        stdout_task.cancel()
+                        stderr_task.cancel()
+                        await process.wait()
+                        raise Exception("Amazon Q CLI command timed out")
+
+                stdout_lines = _decode_output_lines(stdout_chunks)
+                stderr_lines = _decode_output_lines(stderr_chunks)
+                logger.info(
+                    f"Amazon Q completed: {len(stdout_lines)} stdout lines, {len(stderr_lines)} stderr lines"
+                )
 
                 # Join the collected output
                 stdout_output = '\n'.join(stdout_lines)
@@ -394,13 +552,14 @@ class AmazonQService:
                 )
                 
                 # Log the raw Amazon Q output for debugging
-                logger.info("=" * 60)
-                logger.info("🔍 AMAZON Q RAW OUTPUT:")
-                logger.info("=" * 60)
-                logger.info(f"📏 Output length: {len(stdout_output)} characters")
-                logger.info(f"📄 Raw output preview (first 1000 chars):")
-                logger.info(stdout_output[:1000] + "..." if len(stdout_output) > 1000 else stdout_output)
-                logger.info("=" * 60)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("=" * 60)
+                    logger.debug("🔍 AMAZON Q RAW OUTPUT:")
+                    logger.debug("=" * 60)
+                    logger.debug(f"📏 Output length: {len(stdout_output)} characters")
+                    logger.debug(f"📄 Raw output preview (first 1000 chars):")
+                    logger.debug(stdout_output[:1000] + "..." if len(stdout_output) > 1000 else stdout_output)
+                    logger.debug("=" * 60)
                 
                 # Validate output for executable scripts only, not mentions in analysis text
                 logger.info("Validating Amazon Q response for any executable script content")
@@ -461,62 +620,62 @@ class AmazonQService:
         """Parse Amazon Q CLI output - preserve AWS data while removing CLI artifacts."""
         # Enhanced cleanup: remove CLI artifacts but preserve all AWS data and analysis
         
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         # Log the parsing process
-        logger.info("=" * 60)
-        logger.info("🔧 PARSING AMAZON Q OUTPUT:")
-        logger.info("=" * 60)
-        logger.info(f"📏 Raw input length: {len(raw_output)} characters")
+        if debug_enabled:
+            logger.debug("=" * 60)
+            logger.debug("🔧 PARSING AMAZON Q OUTPUT:")
+            logger.debug("=" * 60)
+            logger.debug(f"📏 Raw input length: {len(raw_output)} characters")
         
         # CRITICAL FIX: Remove ANSI escape codes first (color formatting from terminal)
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        cleaned_output = ansi_escape.sub('', raw_output)
+        cleaned_output = _ANSI_ESCAPE.sub('', raw_output)
         
-        logger.info(f"🧹 After ANSI cleanup: {len(cleaned_output)} characters")
-        logger.info(f"📄 Cleaned preview: {cleaned_output[:200]}...")
+        if debug_enabled:
+            logger.debug(f"🧹 After ANSI cleanup: {len(cleaned_output)} characters")
+            logger.debug(f"📄 Cleaned preview: {cleaned_output[:200]}...")
         
+        # Output too short to pass primary parsing ends up minimally cleaned anyway,
+        # so skip the line scans and fallbacks entirely
+        if len(cleaned_output) < MIN_PARSED_RESPONSE_LENGTH:
+            logger.warning("Amazon Q output is too short to parse, using it with minimal cleaning")
+            response_content = _minimal_clean(cleaned_output)
+            logger.info(f"📤 Parsed output length: {len(response_content)} characters")
+            return {
+                "response": response_content,
+                "conversation_id": None,
+                "source_attributions": [],
+                "raw_output": raw_output,
+            }
+
         lines = cleaned_output.split("\n")
-        cleaned_lines = []
-        
+
         # FIXED: Properly detect when Amazon Q response starts
-        in_response_section = False
-        
-        for line in lines:
-            # Skip empty lines at the start
-            if not line.strip() and not in_response_section:
-                continue
-                
-            # Detect Amazon Q response start patterns
-            if not in_response_section:
-                if any(pattern in line for pattern in [
-                    "> I'll help", "> I'll analyze", "> Let me help", "> Let's analyze",
-                    "> I can help", "> I'll assist", "> I'm analyzing", "> I'll start"
-                ]):
-                    in_response_section = True
-                    logger.info(f"✅ Amazon Q response detected: {line[:100]}...")
-            
-            if in_response_section:
-                # Minimal filtering during response section - preserve almost everything
-                if line.strip():
-                    # Only skip these specific CLI artifacts
-                    if any(skip_pattern in line for skip_pattern in [
-                        "Command exited with code", "Execution finished", "CLI completed"
-                    ]):
-                        continue
-                    cleaned_lines.append(line)
-        
+        response_start = next(
+            (i for i, line in enumerate(lines) if _RESPONSE_START_RE.search(line)), None
+        )
+
+        if response_start is None:
+            response_content = ""
+        else:
+            logger.info(f"✅ Amazon Q response detected: {lines[response_start][:100]}...")
+            # Minimal filtering during response section - preserve almost everything,
+            # only dropping blank lines and these specific CLI artifacts
+            response_content = "\n".join(
+                line
+                for line in lines[response_start:]
+                if line.strip() and not _RESPONSE_SKIP_RE.search(line)
+            )
+
         # If primary parsing yields minimal content, try fallback methods
-        response_content = "\n".join(cleaned_lines)
-        
-        if len(response_content) < 200:
+        if len(response_content) < MIN_PARSED_RESPONSE_LENGTH:
             logger.warning("Primary parsing yielded minimal content, trying fallback methods")
             
             # Fallback 1: Extract everything after first meaningful line
             meaningful_start = -1
             for i, line in enumerate(lines):
-                if any(word in line.lower() for word in [
-                    "analyze", "help", "check", "instances", "resources", "costs", "optimization"
-                ]) and len(line.strip()) > 10:
+                if _MEANINGFUL_LINE_RE.search(line) and len(line.strip()) > 10:
                     meaningful_start = i
                     break
             
@@ -529,28 +688,14 @@ class AmazonQService:
             # Fallback 2: Use most of the raw output with minimal cleaning
             if len(response_content) < 500:
                 logger.warning("All parsing methods failed, using raw output with minimal cleaning")
-                response_content = cleaned_output
-                
-                # Only remove obvious CLI artifacts from the minimal cleaning
-                artifacts_to_remove = [
-                    "Command exited with code",
-                    "Execution finished in",
-                    "Exit code:",
-                    "Process completed"
-                ]
-                
-                for artifact in artifacts_to_remove:
-                    response_content = response_content.replace(artifact, "")
-                
-                # Clean up multiple newlines
-                response_content = re.sub(r'\n\s*\n\s*\n', '\n\n', response_content)
-                response_content = response_content.strip()
+                response_content = _minimal_clean(cleaned_output)
         
         # Log the parsing results
         logger.info(f"📤 Parsed output length: {len(response_content)} characters")
-        logger.info(f"📄 Parsed content preview (first 500 chars):")
-        logger.info(response_content[:500] + "..." if len(response_content) > 500 else response_content)
-        logger.info("=" * 60)
+        if debug_enabled:
+            logger.debug(f"📄 Parsed content preview (first 500 chars):")
+            logger.debug(response_content[:500] + "..." if len(response_content) > 500 else response_content)
+            logger.debug("=" * 60)
 
         # CRITICAL DEBUG: Create the return dictionary and log it
         result_dict = {
@@ -561,14 +706,15 @@ class AmazonQService:
         }
         
         # CRITICAL DEBUG: Log what we're actually returning
-        logger.info("=" * 60)
-        logger.info("🔍 CRITICAL DEBUG - RETURN DICTIONARY:")
-        logger.info("=" * 60)
-        logger.info(f"📋 Return dict keys: {list(result_dict.keys())}")
-        logger.info(f"📏 Return dict response length: {len(result_dict['response'])}")
-        logger.info(f"📄 Return dict response type: {type(result_dict['response'])}")
-        logger.info(f"📝 Return dict response preview: {repr(result_dict['response'][:200])}")
-        logger.info("=" * 60)
+        if debug_enabled:
+            logger.debug("=" * 60)
+            logger.debug("🔍 CRITICAL DEBUG - RETURN DICTIONARY:")
+            logger.debug("=" * 60)
+            logger.debug(f"📋 Return dict keys: {list(result_dict.keys())}")
+            logger.debug(f"📏 Return dict response length: {len(result_dict['response'])}")
+            logger.debug(f"📄 Return dict response type: {type(result_dict['response'])}")
+            logger.debug(f"📝 Return dict response preview: {repr(result_dict['response'][:200])}")
+            logger.debug("=" * 60)
 
         return result_dict
 
@@ -577,7 +723,8 @@ class AmazonQService:
         """Send a chat message to Amazon Q via CLI."""
         prompt = message
 
-        raw_output = await self._run_cli_command(prompt)
+        # Conversations aren't idempotent; repeating a message must reach Amazon Q again
+        raw_output = await self._run_cli_command(prompt, use_cache=False)
         return self._parse_cli_output(raw_output)
 
     @handle_cli_errors
@@ -706,14 +853,15 @@ AMAZON Q: Execute comprehensive GLOBAL MULTI-REGION analysis starting with EU-WE
         parsed_result = self._parse_cli_output(raw_output)
         
         # CRITICAL DEBUG: Log what query_cost_optimization is returning
-        logger.info("=" * 60)
-        logger.info("🔍 CRITICAL DEBUG - QUERY_COST_OPTIMIZATION RETURN:")
-        logger.info("=" * 60)
-        logger.info(f"📋 Parsed result keys: {list(parsed_result.keys()) if isinstance(parsed_result, dict) else 'Not a dict'}")
-        logger.info(f"📏 Parsed result response length: {len(parsed_result.get('response', '')) if isinstance(parsed_result, dict) else 'N/A'}")
-        logger.info(f"📄 Parsed result response type: {type(parsed_result.get('response')) if isinstance(parsed_result, dict) else 'N/A'}")
-        logger.info(f"📝 Parsed result response preview: {repr(parsed_result.get('response', '')[:200]) if isinstance(parsed_result, dict) else 'N/A'}")
-        logger.info("=" * 60)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=" * 60)
+            logger.debug("🔍 CRITICAL DEBUG - QUERY_COST_OPTIMIZATION RETURN:")
+            logger.debug("=" * 60)
+            logger.debug(f"📋 Parsed result keys: {list(parsed_result.keys()) if isinstance(parsed_result, dict) else 'Not a dict'}")
+            logger.debug(f"📏 Parsed result response length: {len(parsed_result.get('response', '')) if isinstance(parsed_result, dict) else 'N/A'}")
+            logger.debug(f"📄 Parsed result response type: {type(parsed_result.get('response')) if isinstance(parsed_result, dict) else 'N/A'}")
+            logger.debug(f"📝 Parsed result response preview: {repr(parsed_result.get('response', '')[:200]) if isinstance(parsed_result, dict) else 'N/A'}")
+            logger.debug("=" * 60)
         
         return parsed_result
 
@@ -1299,129 +1447,66 @@ CRITICAL: Include specific DB identifiers, exact utilization metrics, precise co
     async def comprehensive_cost_analysis(self, services: List[str] = None) -> Dict:
         """Perform comprehensive cost optimization analysis across multiple services."""
         services_list = services or ["EC2", "EBS", "S3", "Lambda", "RDS"]
-        services_str = ", ".join(services_list)
-
-        query = f"""COMPREHENSIVE MULTI-SERVICE AWS COST OPTIMIZATION ANALYSIS FOR DASHBOARD CREATION
-
-{ENHANCED_DASHBOARD_INSTRUCTIONS}
-
-SCOPE: COMPLETE ANALYSIS ACROSS SERVICES: {services_str}
-
-MISSION: Provide exhaustive cost optimization analysis across all specified AWS services to enable comprehensive dashboard creation with maximum actionable insights.
-
-MANDATORY MULTI-SERVICE ANALYSIS REQUIREMENTS:
-
-1. EXECUTIVE SUMMARY WITH TOTALS:
-   - Total current monthly AWS spend across all services: $[exact_amount]
-   - Total potential monthly savings across all services: $[exact_amount]
-   - Annual savings projection: $[monthly_savings * 12]
-   - Overall cost reduction percentage: [percentage]%
-   - Number of resources analyzed by service
-   - Top 3 optimization opportunities by dollar impact
-
-2. SERVICE-BY-SERVICE DETAILED BREAKDOWN:
-
-   For each service ({services_str}), provide:
-
-   A. RESOURCE INVENTORY:
-      - Complete resource counts and identifiers
-      - Resource specifications and configurations
-      - Creation dates and last modified timestamps
-      - Tag-based categorization and cost allocation
-
-   B. COST ANALYSIS:
-      - Current monthly spend for this service: $[exact_amount]
-      - Cost breakdown by resource type
-      - Potential monthly savings for this service: $[exact_amount]
-      - Percentage of total AWS spend: [percentage]%
-
-   C. OPTIMIZATION OPPORTUNITIES:
-      - Right-sizing opportunities with specific recommendations
-      - Termination candidates with exact cost savings
-      - Storage optimization and lifecycle opportunities
-      - Reserved instance purchase recommendations
-      - Specific resource IDs and implementation actions
-
-3. CROSS-SERVICE OPTIMIZATION PATTERNS:
-   - Resources that work together (EC2 + EBS combinations)
-   - Data transfer optimization opportunities
-   - Architecture improvements that affect multiple services
-   - Compliance and security optimizations with cost impact
-
-4. PRIORITIZED RECOMMENDATIONS BY IMPACT:
-
-   HIGH IMPACT OPPORTUNITIES (>$1000/month savings):
-   - Resource ID: [specific_identifier]
-   - Service: [AWS_service]
-   - Current monthly cost: $[amount]
-   - Optimization action: [specific_action]
-   - Potential monthly savings: $[amount]
-   - Implementation complexity: [Low/Medium/High]
-   - Risk level: [Low/Medium/High]
 
-   MEDIUM IMPACT OPPORTUNITIES ($200-1000/month savings):
-   - [Same detailed format as above]
-
-   LOW IMPACT OPPORTUNITIES (<$200/month savings):
-   - [Same detailed format as above]
-
-5. IMPLEMENTATION ROADMAP WITH TIMELINE:
-
-   IMMEDIATE ACTIONS (0-7 days):
-   - Terminate unused resources - Total savings: $[amount]
-   - Delete unattached volumes - Total savings: $[amount]
-   - Clean up unused S3 objects - Total savings: $[amount]
-   - Specific commands for each action
-
-   SHORT TERM ACTIONS (1-4 weeks):
-   - Right-size underutilized instances - Total savings: $[amount]
-   - Implement storage lifecycle policies - Total savings: $[amount]
-   - Optimize Lambda memory allocation - Total savings: $[amount]
-
-   MEDIUM TERM ACTIONS (1-3 months):
-   - Purchase reserved instances - Total savings: $[amount]
-   - Implement comprehensive tagging strategy
-   - Set up automated cost monitoring and alerts
+        # Per-service analyzers run concurrently instead of one long sequential prompt
+        analyzers = {
+            "EC2": self.analyze_ec2_underutilization,
+            "EBS": self.analyze_ebs_underutilization,
+            "S3": self.analyze_s3_underutilization,
+            "LAMBDA": self.analyze_lambda_underutilization,
+            "RDS": self.analyze_rds_underutilization,
+        }
+        tasks = []
+        for service in services_list:
+            analyzer = analyzers.get(service.upper())
+            if analyzer:
+                tasks.append(analyzer())
+            else:
+                tasks.append(
+                    self.query_cost_optimization(
+                        query=f"Cost optimization analysis for {service}",
+                        focus_services=[service.upper()],
+                    )
+                )
 
-6. COST SAVINGS CALCULATIONS:
-   - Total potential monthly savings: $[exact_amount]
-   - Annual savings projection: $[amount]
-   - Implementation costs: $[amount]
-   - Net annual savings: $[amount]
-   - ROI percentage: [percentage]%
-   - Payback period: [months]
-
-7. RISK ASSESSMENT AND MITIGATION:
-   - Low risk optimizations (immediate implementation): $[savings_amount]
-   - Medium risk optimizations (testing required): $[savings_amount]
-   - High risk optimizations (careful evaluation needed): $[savings_amount]
-
-8. SERVICE-SPECIFIC TOTALS:
-   - EC2 total potential savings: $[amount]
-   - EBS total potential savings: $[amount]
-   - S3 total potential savings: $[amount]
-   - Lambda total potential savings: $[amount]
-   - RDS total potential savings: $[amount]
-
-9. DETAILED RESOURCE LISTS:
-   Provide complete lists with:
-   - Resource identifiers (IDs, ARNs, names)
-   - Current configurations and costs
-   - Recommended changes and expected savings
-   - Implementation commands and procedures
-
-CRITICAL OUTPUT REQUIREMENTS:
-- Include exact dollar amounts for all cost calculations
-- Provide specific resource identifiers for every recommendation
-- Structure data clearly for dashboard parsing and visualization
-- Include implementation complexity and risk assessments
-- Calculate total savings potential across all services
-- Provide timeline-based implementation roadmap
-
-TARGET: Create the most comprehensive cost optimization analysis possible for sophisticated dashboard creation with maximum actionable insights and quantified business impact."""
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        sections = []
+        raw_outputs = []
+        failures = []
+        for service, result in zip(services_list, results):
+            if isinstance(result, Exception):
+                error_detail = getattr(result, "detail", str(result))
+                logger.error(f"Comprehensive analysis failed for {service}: {error_detail}")
+                failures.append(result)
+                sections.append(f"## {service}\n\nAnalysis failed: {error_detail}")
+            else:
+                sections.append(f"## {service}\n\n{result['response']}")
+                raw_outputs.append(result.get("raw_output", ""))
+
+        # Only fail the whole analysis if every service failed
+        if len(failures) == len(services_list):
+            raise failures[0]
+
+        return {
+            "response": "\n\n".join(sections),
+            "conversation_id": None,
+            "source_attributions": [],
+            "raw_output": "\n\n".join(raw_outputs),
+        }
 
-        raw_output = await self._run_cli_command(query)
-        return self._parse_cli_output(raw_output)
+    async def analyze_all(self, time_range: str = "30d") -> List:
+        """
+        Run the EC2, EBS, S3 and overall cost analyses concurrently.
+        Returns results in that order; failed analyses are returned as their exception.
+        """
+        return await asyncio.gather(
+            self.analyze_ec2_underutilization(time_range),
+            self.analyze_ebs_underutilization(),
+            self.analyze_s3_underutilization(),
+            self.query_cost_optimization("overall"),
+            return_exceptions=True,
+        )
 
     @handle_cli_errors
     async def query_for_dashboard_creation(self, query: str, services: List[str] = None) -> Dict:
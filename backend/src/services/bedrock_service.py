@@ -1,14 +1,16 @@
+import asyncio
 import json
 import logging
 import time
 from functools import wraps
 from typing import Dict, List
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError, ReadTimeoutError
 from fastapi import HTTPException
 
+from src.core.aws import create_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,31 +51,45 @@ class BedrockService:
             read_timeout=timeout,  # Time to read response (should be longer for Bedrock agents)
             max_pool_connections=50
         )
-        self.client = boto3.client("bedrock-agent-runtime", config=config)
+        self.client = create_client("bedrock-agent-runtime", config=config)
         self.timeout = timeout
         self.max_retries = max_retries
 
+    def _invoke_agent_sync(
+        self, agent_id: str, agent_alias_id: str, session_id: str, input_text: str
+    ) -> str:
+        """Call the agent and drain its event stream (blocking, runs in a worker thread)."""
+        response = self.client.invoke_agent(
+            agentId=agent_id,
+            agentAliasId=agent_alias_id,
+            sessionId=session_id,
+            inputText=input_text,
+        )
+
+        # Process streaming response
+        parts = []
+        for event in response["completion"]:
+            if "chunk" in event:
+                chunk = event["chunk"]
+                if "bytes" in chunk:
+                    parts.append(chunk["bytes"])
+        return b"".join(parts).decode("utf-8")
+
     @handle_aws_errors
     async def invoke_agent(
         self, agent_id: str, agent_alias_id: str, session_id: str, input_text: str
     ) -> Dict:
         """Invoke Bedrock agent for processing."""
         try:
-            response = self.client.invoke_agent(
-                agentId=agent_id,
-                agentAliasId=agent_alias_id,
-                sessionId=session_id,
-                inputText=input_text,
+            # boto3 is synchronous; keep the request and stream reads off the event loop
+            result = await asyncio.to_thread(
+                self._invoke_agent_sync,
+                agent_id,
+                agent_alias_id,
+                session_id,
+                input_text,
             )
 
-            # Process streaming response
-            result = ""
-            for event in response["completion"]:
-                if "chunk" in event:
-                    chunk = event["chunk"]
-                    if "bytes" in chunk:
-                        result += chunk["bytes"].decode("utf-8")
-
             return {"response": result}
         except ClientError as e:
             logger.error(f"Bedrock agent error: {e}")
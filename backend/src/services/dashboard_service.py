@@ -2,12 +2,16 @@ import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping
 
 from jinja2 import Template
 
 logger = logging.getLogger(__name__)
 
+# Extra site files uploaded with every dashboard, built once at import (read-only, shared)
+STATIC_ASSETS: Mapping[str, str] = MappingProxyType({})
+
 
 class DashboardService:
     def __init__(self):
@@ -668,7 +672,7 @@ class DashboardService:
         </html>
         """
 
-    def get_static_assets(self) -> Dict[str, str]:
+    def get_static_assets(self) -> Mapping[str, str]:
         """Return additional CSS/JS files optimized for React static serving (deprecated)."""
         # This method is deprecated as we now use simple HTML dashboards
-        return {}
+        return STATIC_ASSETS
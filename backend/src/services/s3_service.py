@@ -1,14 +1,34 @@
+import asyncio
 import json
 import logging
 from functools import wraps
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
-import boto3
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
 
+from src.core.aws import create_client
+
 logger = logging.getLogger(__name__)
 
+# Objects larger than this are sent as multipart uploads (S3's minimum part size is 5 MB)
+MULTIPART_THRESHOLD = 5 * 1024 * 1024
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+# Parts in flight per multipart upload, bounding memory held by pending parts
+MULTIPART_CONCURRENCY = 4
+
+# Public site URL templates, indexed by use_website_endpoint (REST endpoint, website endpoint)
+SITE_URL_TEMPLATES = (
+    "https://{bucket}.s3.{region}.amazonaws.com/{site_id}/index.html",
+    "https://{bucket}.s3-website-{region}.amazonaws.com/{site_id}/index.html",
+)
+
+EMBED_CODE_TEMPLATE = (
+    '<iframe src="{url}" width="{width}" height="{height}" '
+    'frameborder="0" allowfullscreen></iframe>'
+)
+
 
 def handle_aws_errors(func):
     @wraps(func)
@@ -30,55 +50,135 @@ def handle_aws_errors(func):
 
 class S3Service:
     def __init__(self, bucket_name: str, region: str = "us-east-1", use_website_endpoint: bool = True):
-        self.s3_client = boto3.client("s3", region_name=region)
+        self.s3_client = create_client("s3", region_name=region)
         self.bucket_name = bucket_name
         self.region = region
         self.use_website_endpoint = use_website_endpoint
 
-    @handle_aws_errors
-    async def upload_static_site(
-        self,
-        html_content: str,
-        site_id: str,
-        additional_files: Optional[Dict[str, str]] = None,
-    ) -> str:
-        """Upload static site to S3 and return public URL."""
+    def get_site_url(self, site_id: str) -> str:
+        """Return the public URL of a site, pointing directly to index.html for reliability."""
+        return SITE_URL_TEMPLATES[self.use_website_endpoint].format(
+            bucket=self.bucket_name, region=self.region, site_id=site_id
+        )
+
+    async def _put_object(self, key: str, body: str, content_type: str) -> None:
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        if len(data) > MULTIPART_THRESHOLD:
+            await self._put_multipart(key, data, content_type)
+            return
+
+        # boto3 is synchronous; run the PUT in a worker thread so uploads can overlap
+        await asyncio.to_thread(
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+        )
+
+    async def _put_multipart(self, key: str, data: bytes, content_type: str) -> None:
+        """Upload a large object as concurrently sent multipart parts."""
+        upload = await asyncio.to_thread(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=key,
+            ContentType=content_type,
+        )
+        upload_id = upload["UploadId"]
+        semaphore = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+        view = memoryview(data)
+
+        async def upload_part(part_number: int, offset: int) -> Dict:
+            async with semaphore:
+                part = await asyncio.to_thread(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=view[offset : offset + MULTIPART_PART_SIZE].tobytes(),
+                )
+            return {"PartNumber": part_number, "ETag": part["ETag"]}
+
         try:
-            # Upload main HTML file
-            self.s3_client.put_object(
+            parts = await asyncio.gather(
+                *(
+                    upload_part(part_number, offset)
+                    for part_number, offset in enumerate(
+                        range(0, len(data), MULTIPART_PART_SIZE), start=1
+                    )
+                )
+            )
+            await asyncio.to_thread(
+                self.s3_client.complete_multipart_upload,
                 Bucket=self.bucket_name,
-                Key=f"{site_id}/index.html",
-                Body=html_content,
-                ContentType="text/html",
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
             )
+        except Exception:
+            # Don't leave orphaned parts billing in the bucket
+            await asyncio.to_thread(
+                self.s3_client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+            )
+            raise
 
-            # Upload additional files (CSS, JS, etc.)
-            if additional_files:
-                for file_path, content in additional_files.items():
-                    content_type = self._get_content_type(file_path)
-                    self.s3_client.put_object(
-                        Bucket=self.bucket_name,
-                        Key=f"{site_id}/{file_path}",
-                        Body=content,
-                        ContentType=content_type,
-                    )
-
-            # Configure website hosting if not already done
-            await self._configure_website_hosting()
-            
-            # Configure bucket policy for public read access
-            await self._configure_public_read_policy()
-
-            # Return public URL pointing directly to index.html for reliability
-            if self.use_website_endpoint:
-                return f"https://{self.bucket_name}.s3-website-{self.region}.amazonaws.com/{site_id}/index.html"
-            else:
-                return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{site_id}/index.html"
+    @handle_aws_errors
+    async def upload_html(self, html_content: str, site_id: str) -> None:
+        """Upload the main HTML file of a site."""
+        try:
+            await self._put_object(f"{site_id}/index.html", html_content, "text/html")
+        except ClientError as e:
+            logger.error(f"S3 upload error: {e}")
+            raise
 
+    @handle_aws_errors
+    async def upload_assets(self, site_id: str, files: Optional[Mapping[str, str]]) -> None:
+        """Upload additional site files (CSS, JS, etc.) concurrently."""
+        if not files:
+            return
+        try:
+            await asyncio.gather(
+                *(
+                    self._put_object(
+                        f"{site_id}/{file_path}",
+                        content,
+                        self._get_content_type(file_path),
+                    )
+                    for file_path, content in files.items()
+                )
+            )
         except ClientError as e:
             logger.error(f"S3 upload error: {e}")
             raise
 
+    @handle_aws_errors
+    async def configure_site_hosting(self) -> None:
+        """Make sure the bucket serves uploaded sites publicly."""
+        # Configure website hosting if not already done
+        await self._configure_website_hosting()
+
+        # Configure bucket policy for public read access
+        await self._configure_public_read_policy()
+
+    @handle_aws_errors
+    async def upload_static_site(
+        self,
+        html_content: str,
+        site_id: str,
+        additional_files: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Upload static site to S3 and return public URL."""
+        await asyncio.gather(
+            self.upload_html(html_content, site_id),
+            self.upload_assets(site_id, additional_files),
+        )
+        await self.configure_site_hosting()
+        return self.get_site_url(site_id)
+
     @handle_aws_errors
     async def _configure_website_hosting(self):
         """Configure S3 bucket for static website hosting."""
@@ -88,8 +188,10 @@ class S3Service:
                 "ErrorDocument": {"Key": "error.html"},
             }
 
-            self.s3_client.put_bucket_website(
-                Bucket=self.bucket_name, WebsiteConfiguration=website_config
+            await asyncio.to_thread(
+                self.s3_client.put_bucket_website,
+                Bucket=self.bucket_name,
+                WebsiteConfiguration=website_config,
             )
         except ClientError as e:
             if e.response["Error"]["Code"] != "NoSuchWebsiteConfiguration":
@@ -118,9 +220,10 @@ class S3Service:
             policy_json = json.dumps(bucket_policy)
 
             # Apply bucket policy
-            self.s3_client.put_bucket_policy(
+            await asyncio.to_thread(
+                self.s3_client.put_bucket_policy,
                 Bucket=self.bucket_name,
-                Policy=policy_json
+                Policy=policy_json,
             )
             
             logger.info(f"Bucket policy configured for public read access on {self.bucket_name}")
@@ -154,13 +257,11 @@ class S3Service:
 
         return "application/octet-stream"
 
-    @handle_aws_errors
-    async def create_embed_code(
+    def create_embed_code(
         self, dashboard_url: str, width: str = "100%", height: str = "600px"
     ) -> str:
         """Create embeddable iframe code for the dashboard."""
-        embed_code = f'<iframe src="{dashboard_url}" width="{width}" height="{height}" frameborder="0" allowfullscreen></iframe>'
-        return embed_code
+        return EMBED_CODE_TEMPLATE.format(url=dashboard_url, width=width, height=height)
 
     @handle_aws_errors
     async def list_dashboards(self) -> List[Dict]:
@@ -173,14 +274,10 @@ class S3Service:
             dashboards = []
             for prefix in response.get("CommonPrefixes", []):
                 site_id = prefix["Prefix"].rstrip("/")
-                if self.use_website_endpoint:
-                    url = f"https://{self.bucket_name}.s3-website-{self.region}.amazonaws.com/{site_id}/index.html"
-                else:
-                    url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{site_id}/index.html"
                 dashboards.append(
                     {
                         "site_id": site_id,
-                        "url": url,
+                        "url": self.get_site_url(site_id),
                         "created": "N/A",  # Could be enhanced to get actual creation time
                     }
                 )
@@ -0,0 +1,14 @@
+import time
+from datetime import datetime
+
+# ISO timestamp cache, refreshed at most once per second
+_cached_ts = {"sec": 0, "iso": ""}
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time as an ISO string, cached per whole second."""
+    sec = int(time.time())
+    if sec != _cached_ts["sec"]:
+        _cached_ts["iso"] = datetime.utcfromtimestamp(sec).isoformat()
+        _cached_ts["sec"] = sec
+    return _cached_ts["iso"]
@@ -0,0 +1,34 @@
+"""Request model validation edge cases."""
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.requests import BULK_DATA_SIZE_LIMIT, BulkDataProcessingRequest
+
+
+def test_bulk_request_accepts_integers_beyond_64_bits():
+    # orjson can't encode these, but they are valid JSON and within the size limit
+    request = BulkDataProcessingRequest(data_objects=[{"n": 2**70}])
+    assert request.data_objects == [{"n": 2**70}]
+
+
+def test_bulk_request_accepts_deeply_nested_objects():
+    nested = {"leaf": 1}
+    for _ in range(300):
+        nested = {"child": nested}
+    request = BulkDataProcessingRequest(data_objects=[nested])
+    assert len(request.data_objects) == 1
+
+
+def test_bulk_request_rejects_oversized_payload():
+    with pytest.raises(ValidationError, match="exceeds 1MB limit"):
+        BulkDataProcessingRequest(
+            data_objects=[{"blob": "x" * (BULK_DATA_SIZE_LIMIT // 2)} for _ in range(3)]
+        )
+
+
+def test_bulk_request_rejects_oversized_payload_with_big_integers():
+    with pytest.raises(ValidationError, match="exceeds 1MB limit"):
+        BulkDataProcessingRequest(
+            data_objects=[{"n": 2**70, "blob": "x" * BULK_DATA_SIZE_LIMIT}]
+        )
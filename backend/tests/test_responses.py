@@ -0,0 +1,107 @@
+"""
+Responses built with build_response (model_construct) must serialize exactly like
+the validated models they stand in for.
+"""
+
+import orjson
+import pytest
+
+from src.api.routes.bedrock import _processing_response
+from src.models.responses import (AmazonQResponse, BedrockProcessingResponse,
+                                  DashboardResponse, ErrorResponse, QueryType,
+                                  WorkflowResponse, build_response,
+                                  create_error_response, create_model_response)
+
+TIMESTAMP = "2025-01-01T00:00:00"
+
+AMAZON_Q_DATA = {
+    "query": "Find underutilized EC2 instances",
+    "response": "i-0abc123 is idle",
+    "conversation_id": None,
+    "source_attributions": [],
+    "timestamp": TIMESTAMP,
+    "query_type": QueryType.EC2,
+}
+
+BEDROCK_DATA = {
+    "processed_data": {"summary": "ok", "savings": 12.5},
+    "processing_type": "dashboard_summary",
+    "session_id": "session-1",
+    "timestamp": TIMESTAMP,
+    "metadata": {"objects_count": 2},
+}
+
+DASHBOARD_DATA = {
+    "dashboard_url": "https://example.com/dashboards/site-1/index.html",
+    "site_id": "site-1",
+    "embed_code": '<iframe src="https://example.com"></iframe>',
+    "dashboard_type": "cost_optimization",
+    "timestamp": TIMESTAMP,
+    "title": "Cost Analysis Dashboard",
+    "metadata": {"static_assets_count": 3},
+}
+
+
+@pytest.mark.parametrize(
+    "model, data",
+    [
+        (AmazonQResponse, AMAZON_Q_DATA),
+        (BedrockProcessingResponse, BEDROCK_DATA),
+        (DashboardResponse, DASHBOARD_DATA),
+    ],
+)
+def test_build_response_matches_validated_model(model, data):
+    assert build_response(model, **data).model_dump_json() == model(**data).model_dump_json()
+
+
+def test_workflow_response_matches_validated_model():
+    constructed = build_response(
+        WorkflowResponse,
+        workflow_id="workflow-1",
+        amazon_q_results=[build_response(AmazonQResponse, **AMAZON_Q_DATA)],
+        bedrock_processing=build_response(BedrockProcessingResponse, **BEDROCK_DATA),
+        dashboard=build_response(DashboardResponse, **DASHBOARD_DATA),
+        total_execution_time=1.5,
+        timestamp=TIMESTAMP,
+        status="completed",
+    )
+    validated = WorkflowResponse(
+        workflow_id="workflow-1",
+        amazon_q_results=[AmazonQResponse(**AMAZON_Q_DATA)],
+        bedrock_processing=BedrockProcessingResponse(**BEDROCK_DATA),
+        dashboard=DashboardResponse(**DASHBOARD_DATA),
+        total_execution_time=1.5,
+        timestamp=TIMESTAMP,
+        status="completed",
+    )
+    assert constructed.model_dump_json() == validated.model_dump_json()
+
+
+def test_error_response_matches_validated_model():
+    constructed = create_error_response(
+        "validation_error", "Bad input", {"field": "query"}, timestamp=TIMESTAMP
+    )
+    validated = ErrorResponse(
+        error="validation_error",
+        message="Bad input",
+        details={"field": "query"},
+        timestamp=TIMESTAMP,
+    )
+    assert constructed.model_dump_json() == validated.model_dump_json()
+
+
+def test_processing_response_matches_validated_envelope():
+    response = _processing_response(
+        "Data processed successfully",
+        BEDROCK_DATA["processed_data"],
+        BEDROCK_DATA["processing_type"],
+        BEDROCK_DATA["session_id"],
+        BEDROCK_DATA["metadata"],
+    )
+    body = orjson.loads(response.body)
+
+    validated = BedrockProcessingResponse(**{**BEDROCK_DATA, "timestamp": body["timestamp"]})
+    expected = create_model_response(
+        validated, message="Data processed successfully", timestamp=body["timestamp"]
+    )
+    assert body == orjson.loads(expected)